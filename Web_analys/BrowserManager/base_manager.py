@@ -3,21 +3,131 @@
 提供通用的浏览器管理接口，支持多种浏览器实现
 """
 from abc import ABC, abstractmethod
-from typing import Dict, Optional, List
-import sys
+from typing import ClassVar, Dict, Optional, List, Tuple
+import os
 import json
+import time
+import logging
+import atexit
+import socket
+import asyncio
+import threading
+import platform
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
+import requests
+from requests.adapters import HTTPAdapter
+from playwright.async_api import async_playwright, Browser
 
-# 添加 utils 目录到路径
-utils_path = Path(__file__).parent.parent.parent / "utils"
-if str(utils_path) not in sys.path:
-    sys.path.insert(0, str(utils_path))
-from url_utils import is_target_url
+try:
+    import orjson
+except ImportError:
+    # orjson 为可选依赖，未安装时使用标准库 json
+    orjson = None
+
+try:
+    import psutil
+except ImportError:
+    # psutil 为可选依赖，未安装时通过 tasklist/pgrep 子进程检查浏览器进程
+    psutil = None
+
+from utils.url_utils import is_target_url, compile_target_matcher
+
+# 正在进行中的浏览器检查：{(浏览器 URL, 浏览器类型, 目标 URL): Future}，用于合并并发的重复检查
+_INFLIGHT_PROBES: Dict[Tuple[str, str, Tuple[str, ...]], asyncio.Future] = {}
+
+# 浏览器内部页面（非网页内容）的 URL 前缀，匹配目标 URL 前跳过
+SPECIAL_PAGE_PREFIXES = ('chrome://', 'about:', 'devtools://')
+
+# 加快调试浏览器冷启动的参数：跳过首次运行向导、默认浏览器检查、组件更新和同步等后台任务
+FAST_STARTUP_FLAGS = (
+    "--no-first-run",
+    "--no-default-browser-check",
+    "--disable-background-networking",
+    "--disable-component-update",
+    "--disable-sync",
+    "--disable-features=Translate,MediaRouter,OptimizationHints",
+    "--disable-renderer-backgrounding",
+    "--disable-background-timer-throttling",
+    "--metrics-recording-only"
+)
+
+# 各浏览器在不同操作系统下的常见安装路径（按优先级排列，未列出的系统按 Linux 处理）
+BROWSER_PATH_CANDIDATES = {
+    'chrome': {
+        'Windows': [
+            r"C:\Program Files\Google\Chrome\Application\chrome.exe",
+            r"C:\Program Files (x86)\Google\Chrome\Application\chrome.exe",
+            r"~\AppData\Local\Google\Chrome\Application\chrome.exe"
+        ],
+        'Darwin': [
+            "/Applications/Google Chrome.app/Contents/MacOS/Google Chrome"
+        ],
+        'Linux': [
+            "/usr/bin/google-chrome",
+            "/usr/bin/google-chrome-stable",
+            "/usr/bin/chromium",
+            "/usr/bin/chromium-browser"
+        ]
+    },
+    'edge': {
+        'Windows': [
+            r"C:\Program Files (x86)\Microsoft\Edge\Application\msedge.exe",
+            r"C:\Program Files\Microsoft\Edge\Application\msedge.exe",
+            r"~\AppData\Local\Microsoft\Edge\Application\msedge.exe"
+        ],
+        'Darwin': [
+            "/Applications/Microsoft Edge.app/Contents/MacOS/Microsoft Edge"
+        ],
+        'Linux': [
+            "/usr/bin/microsoft-edge",
+            "/usr/bin/microsoft-edge-stable",
+            "/usr/bin/msedge"
+        ]
+    }
+}
+
+
+# 当前操作系统类型（"Windows", "Darwin", "Linux"），运行期间不变，导入时检测一次
+_SYSTEM = platform.system()
+
+# 调试浏览器的默认用户数据目录（{kind} 为浏览器类型，未列出的系统按 Linux 处理）
+DEFAULT_PROFILE_DIRS = {
+    'Windows': os.path.expanduser(r"~\AppData\Local\Temp\{kind}-debug-profile"),
+    'Darwin': "/tmp/{kind}-debug-profile",
+    'Linux': "/tmp/{kind}-debug-profile"
+}
+
+
+@lru_cache(maxsize=2)
+def _discover_browser(kind: str) -> Optional[str]:
+    """
+    在常见安装路径中查找浏览器可执行文件（按浏览器类型缓存，进程内只检测一次）
+    
+    Args:
+        kind: 浏览器类型（"chrome" 或 "edge"）
+        
+    Returns:
+        Optional[str]: 可执行文件路径，未找到时返回 None
+    """
+    candidates = BROWSER_PATH_CANDIDATES[kind]
+    for path in candidates.get(_SYSTEM, candidates['Linux']):
+        path = os.path.expanduser(path)
+        if Path(path).exists():
+            return path
+    return None
 
 
 class BaseBrowserManager(ABC):
     """浏览器管理器基类"""
     
+    # browsers.json 随代码发布、运行期间不会变化，所有管理器实例共享一次解析结果
+    _browsers_config: Optional[List[Dict]] = None
+    # 调试接口健康检查共用的 HTTP 会话（保持连接，避免每次检查都重新建立 TCP 连接）
+    _session: ClassVar[Optional[requests.Session]] = None
+    
     def __init__(self, config: Dict):
         """
         初始化浏览器管理器
@@ -26,6 +136,15 @@ class BaseBrowserManager(ABC):
             config: 配置字典
         """
         self.config = config
+        self.logger = logging.getLogger("browser_manager")
+        # 到浏览器的 CDP 连接（懒加载），由管理器持有并在所有会话间共享，直到调用 disconnect()
+        self._playwright = None
+        self._cdp_browser: Optional[Browser] = None
+        self._connect_lock = asyncio.Lock()
+        # 串行化浏览器启动，避免并发的捕获任务在同一端口和用户目录上各自启动一个浏览器
+        self._start_lock = asyncio.Lock()
+        # 目标 URL 在运行期间不变，预编译为一个正则表达式（无法编译时为 None，回退到 is_target_url）
+        self._target_matcher = compile_target_matcher(config.get('target_urls', []))
         # 自动检测当前运行的浏览器进程
         self._detected_browser = self._auto_detect_running_browser()
     
@@ -37,24 +156,40 @@ class BaseBrowserManager(ABC):
         Returns:
             Optional[Dict]: 检测到的浏览器信息，包含 type、url 和 port，如果未检测到返回 None
         """
-        import platform
-        
-        system = platform.system()
+        system = _SYSTEM
         detected_browsers = []
         
         # 加载浏览器配置
         browsers_config = self._load_browsers_config()
         
-        # 检测每个浏览器（使用配置文件中的配置）
-        for browser_config in browsers_config:
+        # 一次性获取进程列表，所有浏览器共用（psutil 不可用时为 None）
+        processes = self._snapshot_processes()
+        
+        # 需要检测的浏览器（使用配置文件中的配置，跳过当前系统没有进程名的浏览器）
+        candidates = [
+            (browser_config, browser_config['process_names'].get(system))
+            for browser_config in browsers_config
+            if browser_config['process_names'].get(system)
+        ]
+        
+        # 检查进程是否运行
+        # 没有 psutil 时每个浏览器都要启动一个子进程，放到线程池中同时进行
+        if processes is None and len(candidates) > 1:
+            with ThreadPoolExecutor(max_workers=len(candidates)) as executor:
+                running = list(executor.map(
+                    lambda candidate: self._check_browser_process(candidate[1], system),
+                    candidates
+                ))
+        else:
+            running = [
+                self._check_browser_process(process_name, system, processes)
+                for _, process_name in candidates
+            ]
+        
+        for (browser_config, _), is_running in zip(candidates, running):
             browser_type = browser_config['type']
-            process_name = browser_config['process_names'].get(system)
             
-            if not process_name:
-                continue
-            
-            # 检查进程是否运行
-            if self._check_browser_process(process_name, system):
+            if is_running:
                 # 获取端口配置
                 port = (
                     self.config.get(browser_config['port_key']) or
@@ -71,18 +206,51 @@ class BaseBrowserManager(ABC):
         # 返回第一个检测到的浏览器（如果有多个，优先返回第一个）
         return detected_browsers[0] if detected_browsers else None
     
-    def _check_browser_process(self, process_name: str, system: str) -> bool:
+    @staticmethod
+    def _snapshot_processes() -> Optional[List[Tuple[str, str]]]:
+        """
+        通过 psutil 一次性获取当前所有进程的名称和命令行
+        
+        Returns:
+            Optional[List[Tuple[str, str]]]: (进程名, 命令行) 列表，psutil 不可用时返回 None
+        """
+        if psutil is None:
+            return None
+        
+        processes = []
+        for proc in psutil.process_iter(['name', 'cmdline']):
+            name = proc.info.get('name') or ''
+            cmdline = ' '.join(proc.info.get('cmdline') or [])
+            processes.append((name, cmdline))
+        return processes
+    
+    def _check_browser_process(
+        self,
+        process_name: str,
+        system: str,
+        processes: Optional[List[Tuple[str, str]]] = None
+    ) -> bool:
         """
         检查指定浏览器进程是否在运行
         
         Args:
             process_name: 进程名称
             system: 操作系统类型（"Windows", "Darwin", "Linux"）
+            processes: 进程快照（来自 _snapshot_processes），为 None 时回退到子进程检查
             
         Returns:
             bool: 如果进程正在运行返回 True
         """
-        import subprocess
+        if processes is not None:
+            if system == "Windows":
+                # 与 tasklist 的 IMAGENAME 过滤一致：按进程名精确匹配（不区分大小写）
+                target = process_name.lower()
+                return any(name.lower() == target for name, _ in processes)
+            # 与 pgrep -f 一致：在完整命令行中查找
+            return any(
+                process_name in cmdline or process_name in name
+                for name, cmdline in processes
+            )
         
         try:
             if system == "Windows":
@@ -101,6 +269,42 @@ class BaseBrowserManager(ABC):
         except:
             return False
     
+    def _is_browser_process_running(self) -> bool:
+        """
+        检查当前管理器对应的浏览器进程是否在运行（不管是否启用远程调试）
+        进程名来自 browsers.json，有 psutil 时直接读取进程列表，不再启动 tasklist/pgrep 子进程
+        
+        Returns:
+            bool: 如果浏览器进程正在运行返回 True
+        """
+        system = _SYSTEM
+        browser_type = self._get_browser_type()
+        for browser_config in self._load_browsers_config():
+            if browser_config['type'] != browser_type:
+                continue
+            process_name = browser_config['process_names'].get(system)
+            if not process_name:
+                return False
+            return self._check_browser_process(process_name, system, self._snapshot_processes())
+        return False
+    
+    @staticmethod
+    def _http_session() -> requests.Session:
+        """
+        获取共享的 HTTP 会话（懒加载，所有管理器实例共用，进程退出时关闭）
+        
+        Returns:
+            requests.Session: HTTP 会话
+        """
+        if BaseBrowserManager._session is None:
+            session = requests.Session()
+            # 只访问本地调试接口，失败时由调用方处理，不做重试
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16, max_retries=0)
+            session.mount('http://', adapter)
+            atexit.register(session.close)
+            BaseBrowserManager._session = session
+        return BaseBrowserManager._session
+    
     def _load_browsers_config(self) -> List[Dict]:
         """
         从 JSON 文件加载浏览器配置
@@ -108,13 +312,22 @@ class BaseBrowserManager(ABC):
         Returns:
             List[Dict]: 浏览器配置列表
         """
+        if BaseBrowserManager._browsers_config is not None:
+            return BaseBrowserManager._browsers_config
+        
         config_file = Path(__file__).parent / "browsers.json"
         
         if not config_file.exists():
             raise FileNotFoundError(f"浏览器配置文件不存在: {config_file}")
         
-        with open(config_file, 'r', encoding='utf-8') as f:
-            return json.load(f)
+        if orjson is not None:
+            browsers_config = orjson.loads(config_file.read_bytes())
+        else:
+            with open(config_file, 'r', encoding='utf-8') as f:
+                browsers_config = json.load(f)
+        
+        BaseBrowserManager._browsers_config = browsers_config
+        return browsers_config
     
     @abstractmethod
     def start(self) -> None:
@@ -136,6 +349,127 @@ class BaseBrowserManager(ABC):
         """
         pass
     
+    def _build_launch_args(self, executable: str, port: int, user_data_dir: str) -> List[str]:
+        """
+        构建启动调试浏览器的命令行参数
+        
+        Args:
+            executable: 浏览器可执行文件路径
+            port: 远程调试端口
+            user_data_dir: 用户数据目录
+            
+        Returns:
+            List[str]: 启动参数（第一个元素为可执行文件路径）
+        """
+        args = [
+            executable,
+            f'--remote-debugging-port={port}',
+            f'--user-data-dir={user_data_dir}',
+            *FAST_STARTUP_FLAGS
+        ]
+        # 无头模式默认关闭（需要在浏览器窗口中登录 Canvas），可通过配置 browser_headless 开启
+        if self.config.get('browser_headless', False):
+            args.append('--headless=new')
+        return args
+    
+    @staticmethod
+    def _default_profile_dir(kind: str) -> str:
+        """
+        获取调试浏览器的默认用户数据目录
+        
+        Args:
+            kind: 浏览器类型（"chrome" 或 "edge"）
+            
+        Returns:
+            str: 当前系统下的默认用户数据目录
+        """
+        return DEFAULT_PROFILE_DIRS.get(_SYSTEM, DEFAULT_PROFILE_DIRS['Linux']).format(kind=kind)
+    
+    @staticmethod
+    def _spawn_browser(args: List[str]) -> None:
+        """
+        在后台启动浏览器进程（丢弃标准输出和标准错误）
+        POSIX 系统上使用 os.posix_spawn 直接创建进程，不复制当前 Python 进程的内存，
+        并由后台线程等待子进程退出，避免浏览器在运行期间退出后成为僵尸进程；
+        Windows 上使用 subprocess.Popen 并隐藏控制台窗口
+        
+        Args:
+            args: 启动参数，第一个元素为浏览器可执行文件路径
+        """
+        if _SYSTEM != "Windows" and hasattr(os, 'posix_spawn'):
+            file_actions = [
+                (os.POSIX_SPAWN_OPEN, 1, os.devnull, os.O_WRONLY, 0),
+                (os.POSIX_SPAWN_OPEN, 2, os.devnull, os.O_WRONLY, 0)
+            ]
+            pid = os.posix_spawn(args[0], args, os.environ, file_actions=file_actions)
+            threading.Thread(
+                target=os.waitpid,
+                args=(pid, 0),
+                name=f"reap-browser-{pid}",
+                daemon=True
+            ).start()
+            return
+        
+        subprocess.Popen(
+            args,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            creationflags=subprocess.CREATE_NO_WINDOW if hasattr(subprocess, 'CREATE_NO_WINDOW') else 0
+        )
+    
+    def _wait_until_ready(self, port: int, timeout: float = 10.0) -> bool:
+        """
+        等待浏览器的远程调试端口就绪
+        先以指数退避的间隔探测端口是否开始监听（仅建立 TCP 连接），
+        端口可连接后再通过 is_running 确认一次调试接口可用
+        
+        Args:
+            port: 调试端口
+            timeout: 最长等待时间（秒）
+            
+        Returns:
+            bool: 在超时前调试接口可用返回 True
+        """
+        deadline = time.monotonic() + timeout
+        delay = 0.01
+        while True:
+            with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+                sock.settimeout(0.05)
+                port_open = sock.connect_ex(("127.0.0.1", port)) == 0
+            
+            # 端口已监听时调试接口通常也已就绪，未就绪则继续等待
+            if port_open and self.is_running(port):
+                return True
+            
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            time.sleep(min(delay, remaining))
+            delay = min(delay * 2, 0.5)
+    
+    async def is_running_async(self) -> bool:
+        """
+        异步检查浏览器是否在运行（在线程池中执行 is_running，不阻塞事件循环）
+        
+        Returns:
+            bool: 浏览器是否运行中
+        """
+        return await asyncio.to_thread(self.is_running)
+    
+    async def start_async(self) -> None:
+        """
+        异步启动浏览器（在线程池中执行 start，启动等待期间不阻塞事件循环）
+        检查和启动在同一把锁内完成，并发调用时只有第一个调用会真正启动浏览器
+        
+        Raises:
+            Exception: 启动失败时抛出异常
+        """
+        async with self._start_lock:
+            # 等待锁期间浏览器可能已被其他协程启动，重新检查
+            if await self.is_running_async():
+                return
+            await asyncio.to_thread(self.start)
+    
     @abstractmethod
     def get_url(self) -> str:
         """
@@ -146,6 +480,41 @@ class BaseBrowserManager(ABC):
         """
         pass
     
+    async def connect(self) -> Optional[Browser]:
+        """
+        获取到浏览器的 CDP 连接（已连接时直接复用，仅在首次或断开后重新连接）
+        
+        Returns:
+            Optional[Browser]: 已连接的浏览器对象，连接失败返回 None
+        """
+        async with self._connect_lock:
+            if self._cdp_browser is not None and self._cdp_browser.is_connected():
+                return self._cdp_browser
+            
+            # 创建 Playwright 实例（如果还没有）
+            if self._playwright is None:
+                self._playwright = await async_playwright().start()
+            
+            self._cdp_browser = await self._connect_browser(self._playwright, self.get_url())
+            return self._cdp_browser
+    
+    async def disconnect(self) -> None:
+        """断开 CDP 连接并停止 Playwright（不会关闭浏览器进程本身）"""
+        browser, self._cdp_browser = self._cdp_browser, None
+        playwright, self._playwright = self._playwright, None
+        
+        if browser is not None:
+            try:
+                await browser.close()
+            except Exception as e:
+                print(f"⚠️  断开浏览器连接时出错: {e}")
+        
+        if playwright is not None:
+            try:
+                await playwright.stop()
+            except Exception as e:
+                print(f"⚠️  停止 Playwright 时出错: {e}")
+    
     async def get_browser(self) -> Optional[Dict]:
         """
         检测哪个浏览器正在运行 config 里面的网页
@@ -159,24 +528,116 @@ class BaseBrowserManager(ABC):
                 - matched_pages: 匹配的页面 URL 列表
             如果没有找到匹配的浏览器，返回 None
         """
-        # 如果初始化时已检测到浏览器，使用检测到的浏览器
+        # 获取配置中的目标 URL
+        target_urls = self.config.get('target_urls', [])
+        probed_url = None
+        
+        # 如果初始化时已检测到浏览器，优先检查检测到的浏览器
         if self._detected_browser:
             browser_url = self._detected_browser['url']
+            browser_type = self._detected_browser['type']
             
-            # 获取配置中的目标 URL
-            target_urls = self.config.get('target_urls', [])
             if not target_urls:
                 # 如果没有配置目标 URL，直接返回检测到的浏览器信息
                 return {
-                    'type': self._detected_browser['type'],
+                    'type': browser_type,
                     'url': browser_url,
                     'matched_pages': []
                 }
             
-            # 尝试连接浏览器并检查页面
+            result = await self._probe(browser_url, browser_type, target_urls)
+            if result:
+                return result
+            probed_url = browser_url
+        
+        # 检查当前浏览器管理器管理的浏览器
+        if not await self.is_running_async():
+            return None
+        
+        # 获取浏览器远程调试 URL
+        browser_url = self.get_url()
+        
+        if not target_urls:
+            # 如果没有配置目标 URL，只要浏览器运行就返回
+            return {
+                'type': self._get_browser_type(),
+                'url': browser_url,
+                'matched_pages': []
+            }
+        
+        # 同一个地址已经检查过，不再重复连接
+        if browser_url == probed_url:
+            return None
+        
+        return await self._probe(browser_url, self._get_browser_type(), target_urls)
+    
+    async def _probe(
+        self,
+        browser_url: str,
+        browser_type: str,
+        target_urls: List[str]
+    ) -> Optional[Dict]:
+        """
+        连接浏览器并检查是否有页面匹配目标 URL
+        多个调用方同时检查同一个浏览器时，只建立一次连接，其余调用方等待并共享同一个结果
+        
+        Args:
+            browser_url: 浏览器远程调试 URL
+            browser_type: 浏览器类型
+            target_urls: 目标 URL 列表
+            
+        Returns:
+            Optional[Dict]: 找到匹配页面时返回浏览器信息字典（格式同 get_browser），
+                连接失败或没有匹配的页面时返回 None
+        """
+        key = (browser_url, browser_type, tuple(target_urls))
+        inflight = _INFLIGHT_PROBES.get(key)
+        if inflight is not None:
+            return await asyncio.shield(inflight)
+        
+        future = asyncio.get_running_loop().create_future()
+        _INFLIGHT_PROBES[key] = future
+        try:
+            result = await self._probe_browser(browser_url, browser_type, target_urls)
+        except asyncio.CancelledError:
+            # 检查被取消时，让等待中的调用方也收到取消
+            future.cancel()
+            raise
+        except Exception as e:
+            # 检查出错时，等待中的调用方收到同一个异常（而不是被误认为自身被取消）
+            future.set_exception(e)
+            # 标记异常已被获取，没有等待者时也不会产生 "exception was never retrieved" 警告
+            future.exception()
+            raise
+        finally:
+            del _INFLIGHT_PROBES[key]
+        
+        future.set_result(result)
+        return result
+    
+    async def _probe_browser(
+        self,
+        browser_url: str,
+        browser_type: str,
+        target_urls: List[str]
+    ) -> Optional[Dict]:
+        """
+        连接浏览器并检查是否有页面匹配目标 URL（实际执行检查）
+        
+        Args:
+            browser_url: 浏览器远程调试 URL
+            browser_type: 浏览器类型
+            target_urls: 目标 URL 列表
+            
+        Returns:
+            Optional[Dict]: 找到匹配页面时返回浏览器信息字典（格式同 get_browser），
+                连接失败或没有匹配的页面时返回 None
+        """
+        # 优先通过 HTTP /json 接口获取页面列表，无需启动 Playwright 并建立 CDP 连接
+        page_urls = await asyncio.to_thread(self._list_page_urls_via_http, browser_url)
+        
+        if page_urls is None:
             try:
-                from playwright.async_api import async_playwright
-                
                 async with async_playwright() as p:
                     # 使用子类指定的连接方法连接浏览器
                     browser = await self._connect_browser(p, browser_url)
@@ -185,34 +646,7 @@ class BaseBrowserManager(ABC):
                         return None
                     
                     try:
-                        # 获取所有页面
-                        all_pages = []
-                        for context in browser.contexts:
-                            all_pages.extend(context.pages)
-                        
-                        # 检查哪些页面匹配目标 URL
-                        matched_pages = []
-                        for page in all_pages:
-                            page_url = page.url
-                            
-                            # 跳过特殊页面
-                            if page_url.startswith('chrome://') or \
-                               page_url.startswith('about:') or \
-                               page_url.startswith('devtools://'):
-                                continue
-                            
-                            # 检查是否匹配目标 URL
-                            if is_target_url(page_url, target_urls):
-                                matched_pages.append(page_url)
-                        
-                        # 如果找到匹配的页面，返回浏览器信息
-                        if matched_pages:
-                            return {
-                                'type': self._detected_browser['type'],
-                                'url': browser_url,
-                                'matched_pages': matched_pages
-                            }
-                        
+                        page_urls = self._snapshot_page_urls(browser)
                     finally:
                         await browser.close()
             
@@ -220,72 +654,76 @@ class BaseBrowserManager(ABC):
                 # 连接失败或检查出错，返回 None
                 return None
         
-        # 如果没有检测到浏览器，检查当前浏览器管理器管理的浏览器
-        if not self.is_running():
-            return None
-        
-        # 获取浏览器远程调试 URL
-        browser_url = self.get_url()
+        # 检查哪些页面匹配目标 URL（跳过浏览器内部页面）
+        matched_pages = [
+            page_url
+            for page_url in page_urls
+            if not page_url.startswith(SPECIAL_PAGE_PREFIXES)
+            and self._is_target_page(page_url, target_urls)
+        ]
         
-        # 获取配置中的目标 URL
-        target_urls = self.config.get('target_urls', [])
-        if not target_urls:
-            # 如果没有配置目标 URL，只要浏览器运行就返回
+        # 如果找到匹配的页面，返回浏览器信息
+        if matched_pages:
             return {
-                'type': self._get_browser_type(),
+                'type': browser_type,
                 'url': browser_url,
-                'matched_pages': []
+                'matched_pages': matched_pages
             }
         
-        # 尝试连接浏览器并检查页面
-        try:
-            from playwright.async_api import async_playwright
+        # 没有找到匹配的页面
+        return None
+    
+    def _is_target_page(self, page_url: str, target_urls: List[str]) -> bool:
+        """
+        检查页面 URL 是否匹配目标 URL（优先使用预编译的正则表达式）
+        
+        Args:
+            page_url: 页面 URL
+            target_urls: 目标 URL 列表
             
-            async with async_playwright() as p:
-                # 使用子类指定的连接方法连接浏览器
-                browser = await self._connect_browser(p, browser_url)
-                
-                if browser is None:
-                    return None
-                
-                try:
-                    # 获取所有页面
-                    all_pages = []
-                    for context in browser.contexts:
-                        all_pages.extend(context.pages)
-                    
-                    # 检查哪些页面匹配目标 URL
-                    matched_pages = []
-                    for page in all_pages:
-                        page_url = page.url
-                        
-                        # 跳过特殊页面
-                        if page_url.startswith('chrome://') or \
-                           page_url.startswith('about:') or \
-                           page_url.startswith('devtools://'):
-                            continue
-                        
-                        # 检查是否匹配目标 URL
-                        if is_target_url(page_url, target_urls):
-                            matched_pages.append(page_url)
-                    
-                    # 如果找到匹配的页面，返回浏览器信息
-                    if matched_pages:
-                        return {
-                            'type': self._get_browser_type(),
-                            'url': browser_url,
-                            'matched_pages': matched_pages
-                        }
-                    
-                finally:
-                    await browser.close()
+        Returns:
+            bool: 如果匹配返回 True
+        """
+        if self._target_matcher is not None:
+            return self._target_matcher.match(page_url) is not None
+        return is_target_url(page_url, target_urls)
+    
+    @staticmethod
+    def _list_page_urls_via_http(browser_url: str) -> Optional[List[str]]:
+        """
+        通过远程调试 HTTP 接口（/json）获取所有页面的 URL
+        Chrome 和 Edge 原生提供该接口，比建立完整的 Playwright 连接快得多
         
+        Args:
+            browser_url: 浏览器远程调试 URL
+            
+        Returns:
+            Optional[List[str]]: 所有页面的 URL 列表，接口不可用时返回 None
+        """
+        try:
+            response = BaseBrowserManager._http_session().get(f"{browser_url}/json", timeout=2)
+            if response.status_code != 200:
+                return None
+            return [
+                target.get('url', '')
+                for target in response.json()
+                if target.get('type') == 'page'
+            ]
         except Exception:
-            # 连接失败或检查出错，返回 None
             return None
+    
+    @staticmethod
+    def _snapshot_page_urls(browser) -> List[str]:
+        """
+        获取浏览器中所有上下文的页面 URL 快照
         
-        # 没有找到匹配的页面
-        return None
+        Args:
+            browser: 已连接的浏览器对象
+            
+        Returns:
+            List[str]: 所有页面的 URL 列表
+        """
+        return [page.url for context in browser.contexts for page in context.pages]
     
     @abstractmethod
     def _get_browser_type(self) -> str:
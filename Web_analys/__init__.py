@@ -0,0 +1,14 @@
+"""
+Web_analys 网页分析模块
+提供浏览器管理、页面捕获和课程页面抓取功能
+"""
+import sys
+from pathlib import Path
+
+# 包内模块之间使用相对导入，只有 url_utils 通过项目根目录下的 utils 包导入
+# 导入本包时统一将项目根目录加入 sys.path（整个进程只执行一次）
+if not getattr(sys, '_web_analys_path_set', False):
+    _project_root = str(Path(__file__).parent.parent)
+    if _project_root not in sys.path:
+        sys.path.insert(0, _project_root)
+    sys._web_analys_path_set = True
@@ -6,6 +6,12 @@ import json
 from pathlib import Path
 from typing import Dict
 
+try:
+    import orjson
+except ImportError:
+    # orjson 为可选依赖，未安装时使用标准库 json
+    orjson = None
+
 
 class ConfigManager:
     """配置管理器 - 专门处理配置的加载和验证"""
@@ -46,19 +52,23 @@ class ConfigManager:
         # 如果配置文件不存在，创建默认配置
         if not config_path.exists():
             default_config = ConfigManager.get_default_config()
-            with open(config_path, 'w', encoding='utf-8') as f:
-                json.dump(default_config, f, indent=2, ensure_ascii=False)
+            if orjson is not None:
+                config_path.write_bytes(orjson.dumps(default_config, option=orjson.OPT_INDENT_2))
+            else:
+                with open(config_path, 'w', encoding='utf-8') as f:
+                    json.dump(default_config, f, indent=2, ensure_ascii=False)
             print(f"已创建默认配置文件: {config_path}")
             return default_config
         
         # 加载现有配置
-        with open(config_path, 'r', encoding='utf-8') as f:
-            config = json.load(f)
+        if orjson is not None:
+            config = orjson.loads(config_path.read_bytes())
+        else:
+            with open(config_path, 'r', encoding='utf-8') as f:
+                config = json.load(f)
         
         # 规范化路径
-        config = ConfigManager.normalize_paths(config)
-        
-        return config
+        return ConfigManager.normalize_paths(config)
     
     @staticmethod
     def normalize_paths(config: Dict) -> Dict:
@@ -2,19 +2,16 @@
 浏览器会话管理
 负责管理浏览器会话的生命周期
 """
-import sys
+import asyncio
 import logging
-from pathlib import Path
+from collections import deque
 from typing import Optional
-from playwright.async_api import async_playwright, Browser, Page
+from playwright.async_api import Browser, BrowserContext, Page
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
 
-# 添加 Web_analys 目录到路径
-web_analys_dir = Path(__file__).parent.parent
-if str(web_analys_dir) not in sys.path:
-    sys.path.insert(0, str(web_analys_dir))
-
-from BrowserManager.base_manager import BaseBrowserManager
-from core.exceptions import BrowserNotRunningError, PageLoadError
+from utils.url_utils import is_target_url
+from .exceptions import BrowserNotRunningError, PageLoadError
+from ..BrowserManager.base_manager import BaseBrowserManager
 
 
 class BrowserSession:
@@ -34,8 +31,19 @@ class BrowserSession:
         """
         self.browser_manager = browser_manager
         self.logger = logger or logging.getLogger("browser_session")
-        self.playwright = None
         self.browser: Optional[Browser] = None
+        self.context: Optional[BrowserContext] = None
+        self._connect_lock = asyncio.Lock()
+        # 保护默认上下文的解析和上下文池的创建，避免并发的首次调用重复创建
+        self._context_lock = asyncio.Lock()
+        # 上下文池（可选）：并发捕获时每个任务独占一个上下文，0 表示所有页面共用默认上下文
+        self.context_pool_size = browser_manager.config.get('context_pool_size', 0)
+        self._context_pool: Optional[asyncio.Queue] = None
+        self._pooled_contexts: list[BrowserContext] = []
+        # 空闲页面池（可选）：捕获完成的页面导航到 about:blank 后留待复用，0 表示每次都新建页面
+        # 仅在未启用上下文池时生效（启用时页面关闭会把上下文归还到池中）
+        self.page_pool_size = browser_manager.config.get('page_pool_size', 0)
+        self._idle_pages: deque[Page] = deque()
     
     async def ensure_browser_running(self) -> None:
         """
@@ -44,11 +52,12 @@ class BrowserSession:
         Raises:
             BrowserNotRunningError: 浏览器启动失败
         """
-        # 检查浏览器是否在运行
-        if not self.browser_manager.is_running():
+        # 检查浏览器是否在运行（检查和启动都在线程池中执行，不阻塞其他协程）
+        # start_async 会在锁内重新检查，多个会话或任务同时发现浏览器未运行时也只启动一次
+        if not await self.browser_manager.is_running_async():
             self.logger.info("浏览器未运行，正在启动...")
             try:
-                self.browser_manager.start()
+                await self.browser_manager.start_async()
                 self.logger.info("✅ 浏览器启动成功")
             except Exception as e:
                 raise BrowserNotRunningError(
@@ -85,61 +94,44 @@ class BrowserSession:
         # 确保浏览器运行
         await self.ensure_browser_running()
         
-        # 获取浏览器远程调试 URL
-        browser_url = self.browser_manager.get_url()
-        
-        # 创建 Playwright 实例（如果还没有）
-        if self.playwright is None:
-            playwright_instance = await async_playwright().start()
-            self.playwright = playwright_instance
-        
         try:
-            # 连接浏览器（每次打开 URL 都重新连接，确保使用最新的浏览器实例）
-            browser = await self.browser_manager._connect_browser(
-                self.playwright,
-                browser_url
-            )
-            
-            # 如果之前有浏览器实例且不同，关闭旧的
-            if self.browser and self.browser != browser:
-                try:
-                    await self.browser.close()
-                except Exception:
-                    pass
-            
-            self.browser = browser
-            
-            if self.browser is None:
-                raise BrowserNotRunningError(
-                    f"无法连接到浏览器: {browser_url}"
-                )
+            # 复用会话内已建立的 CDP 连接（仅在首次或断开后重新连接）
+            browser = await self._ensure_browser()
             
-            # 创建或获取页面上下文
-            contexts = self.browser.contexts
-            if not contexts:
-                context = await self.browser.new_context()
-            else:
-                context = contexts[0]
+            # 获取页面上下文（启用上下文池时从池中取出，页面关闭后自动归还）
+            context = await self._acquire_context(browser)
             
-            # 创建新页面
-            page = await context.new_page()
+            # 创建新页面（启用页面池时优先复用空闲页面）
+            try:
+                page = self._take_idle_page() or await context.new_page()
+            except Exception:
+                self._release_context(context)
+                raise
+            if self._context_pool is not None:
+                page.once("close", lambda _: self._release_context(context))
             
             # 导航到 URL
-            self.logger.info(f"正在打开 URL: {url}")
+            self.logger.info("正在打开 URL: %s", url)
             try:
                 await page.goto(url, wait_until='domcontentloaded', timeout=wait_timeout)
                 
                 # 如果需要等待加载完成
+                # Canvas 页面有长轮询和统计请求，networkidle 往往要等到超时才返回，
+                # 这里改为等待 load 事件（document.readyState === 'complete'），
+                # 并以配置的 page_load_wait（秒）作为等待上限
                 if wait_for_load:
+                    load_timeout = min(
+                        wait_timeout,
+                        self.browser_manager.config.get('page_load_wait', 2) * 1000
+                    )
                     try:
-                        await page.wait_for_load_state('networkidle', timeout=wait_timeout)
-                    except Exception:
-                        # 如果 networkidle 超时，至少等待一下
-                        import asyncio
-                        await asyncio.sleep(1)
+                        await page.wait_for_load_state('load', timeout=load_timeout)
+                    except PlaywrightTimeoutError:
+                        # 等待时间只是上限，超时后直接继续（DOM 已就绪）
+                        self.logger.debug("等待 load 事件超时 (%sms)，继续处理", load_timeout)
                 
                 current_url = page.url
-                self.logger.info(f"初始页面 URL: {current_url}")
+                self.logger.info("初始页面 URL: %s", current_url)
                 
                 # 如果需要等待页面跳转到目标 URL
                 if wait_for_redirect:
@@ -149,7 +141,7 @@ class BrowserSession:
                         redirect_timeout
                     )
                 
-                self.logger.info(f"✅ 最终页面 URL: {page.url}")
+                self.logger.info("✅ 最终页面 URL: %s", page.url)
                 return page
                 
             except Exception as e:
@@ -163,6 +155,145 @@ class BrowserSession:
                 raise
             raise PageLoadError(url, f"打开 URL 时出错: {str(e)}") from e
     
+    async def _ensure_browser(self) -> Browser:
+        """
+        获取已连接的浏览器（CDP 连接由浏览器管理器持有，多个会话共享同一个连接）
+        
+        Returns:
+            Browser: 已连接的浏览器对象
+        
+        Raises:
+            BrowserNotRunningError: 无法连接到浏览器
+        """
+        async with self._connect_lock:
+            if self.browser is not None and self.browser.is_connected():
+                return self.browser
+            
+            browser = await self.browser_manager.connect()
+            if browser is None:
+                raise BrowserNotRunningError(
+                    f"无法连接到浏览器: {self.browser_manager.get_url()}"
+                )
+            
+            # 重新连接后旧的上下文和页面句柄失效
+            self.context = None
+            self._discard_context_pool()
+            self._idle_pages.clear()
+            self.browser = browser
+            return browser
+    
+    async def _acquire_context(self, browser: Browser) -> BrowserContext:
+        """
+        获取用于打开新页面的浏览器上下文
+        
+        未启用上下文池时返回默认上下文（解析一次后在会话内复用）；
+        启用时首次调用会按默认上下文的登录状态（storage_state）预先创建
+        context_pool_size 个上下文，之后每次从池中取出一个，池空时等待归还
+        
+        Args:
+            browser: 已连接的浏览器对象
+        
+        Returns:
+            BrowserContext: 浏览器上下文
+        
+        Raises:
+            BrowserNotRunningError: 等待期间浏览器重新连接或会话关闭，上下文池已失效
+        """
+        # 在锁内检查并创建，并发的首次调用只会创建一次默认上下文和上下文池
+        async with self._context_lock:
+            if self.context is None:
+                contexts = browser.contexts
+                if not contexts:
+                    self.context = await browser.new_context()
+                else:
+                    self.context = contexts[0]
+            
+            if self.context_pool_size <= 0:
+                return self.context
+            
+            if self._context_pool is None:
+                # 新建的上下文不共享 cookie，通过 storage_state 继承默认上下文的登录状态
+                shared_state = await self.context.storage_state()
+                pool = asyncio.Queue()
+                for _ in range(self.context_pool_size):
+                    context = await browser.new_context(storage_state=shared_state)
+                    self._pooled_contexts.append(context)
+                    pool.put_nowait(context)
+                self._context_pool = pool
+                self.logger.debug("已创建上下文池，大小: %s", self.context_pool_size)
+            
+            pool = self._context_pool
+        
+        # 在锁外等待，池空时其他任务仍可归还上下文
+        context = await pool.get()
+        if context is None:
+            # 上下文池已被丢弃：把结束标记传给下一个等待者，然后放弃本次获取
+            pool.put_nowait(None)
+            raise BrowserNotRunningError("浏览器连接已重置，上下文池已失效")
+        return context
+    
+    def _discard_context_pool(self) -> list[BrowserContext]:
+        """
+        丢弃当前的上下文池，并唤醒仍在等待旧池的任务（它们会收到 BrowserNotRunningError）
+        
+        Returns:
+            list[BrowserContext]: 池中创建的上下文（由调用方决定是否关闭）
+        """
+        if self._context_pool is not None:
+            # 结束标记排在剩余上下文之后，只有正在等待的任务才会取到它
+            self._context_pool.put_nowait(None)
+        self._context_pool = None
+        pooled_contexts, self._pooled_contexts = self._pooled_contexts, []
+        return pooled_contexts
+    
+    def _release_context(self, context: BrowserContext) -> None:
+        """
+        将上下文归还到上下文池（未启用上下文池时不做任何操作）
+        
+        Args:
+            context: 要归还的浏览器上下文
+        """
+        if self._context_pool is not None and context in self._pooled_contexts:
+            self._context_pool.put_nowait(context)
+    
+    def _take_idle_page(self) -> Optional[Page]:
+        """
+        从页面池中取出一个空闲页面（后放入的先取出）
+        
+        Returns:
+            Optional[Page]: 空闲页面，页面池为空或未启用时返回 None
+        """
+        while self._idle_pages:
+            page = self._idle_pages.pop()
+            if not page.is_closed():
+                return page
+        return None
+    
+    async def release_page(self, page: Page) -> None:
+        """
+        释放捕获完成的页面
+        启用页面池且池未满时导航到 about:blank 后留待复用，否则直接关闭
+        
+        Args:
+            page: 要释放的页面
+        """
+        if page.is_closed():
+            return
+        
+        if (
+            self.page_pool_size > 0
+            and self._context_pool is None
+            and len(self._idle_pages) < self.page_pool_size
+        ):
+            try:
+                await page.goto("about:blank")
+                self._idle_pages.append(page)
+                return
+            except Exception as e:
+                self.logger.debug("页面无法复用，直接关闭: %s", e)
+        
+        await page.close()
+    
     async def _wait_for_target_page(
         self, 
         page: Page, 
@@ -180,10 +311,6 @@ class BrowserSession:
         Returns:
             Page: 跳转后的页面对象（可能是同一个或新的页面）
         """
-        import asyncio
-        import sys
-        from pathlib import Path
-        
         # 获取目标 URL 配置
         target_urls = self.browser_manager.config.get('target_urls', [])
         if not target_urls:
@@ -191,63 +318,57 @@ class BrowserSession:
             self.logger.debug("未配置 target_urls，跳过跳转监控")
             return page
         
-        # 导入 URL 匹配工具
-        utils_path = Path(__file__).parent.parent.parent / "utils"
-        if str(utils_path) not in sys.path:
-            sys.path.insert(0, str(utils_path))
-        from url_utils import is_target_url
-        
-        start_time = asyncio.get_event_loop().time()
-        check_interval = 5  # 每 5 秒检查一次
         last_url = page.url
+        # 使用浏览器管理器初始化时预编译的目标 URL 正则（无法编译时为 None，回退到 is_target_url）
+        target_matcher = self.browser_manager._target_matcher
         
-        self.logger.info(f"监控页面跳转，目标 URL: {target_urls}")
+        self.logger.info("监控页面跳转，目标 URL: %s", target_urls)
         
-        while True:
-            # 检查当前页面 URL
-            current_url = page.url
-            
-            # 检查是否匹配目标 URL
-            if is_target_url(current_url, target_urls):
-                self.logger.info(f"✅ 页面已跳转到目标 URL: {current_url}")
-                return page
-            
-            # 检查是否超时
-            elapsed = (asyncio.get_event_loop().time() - start_time) * 1000
-            if elapsed >= timeout:
-                self.logger.warning(
-                    f"⏰ 等待页面跳转超时 ({timeout}ms)，当前 URL: {current_url}"
-                )
-                # 超时后返回当前页面
-                return page
-            
+        def matches_target(current_url: str) -> bool:
+            nonlocal last_url
             # 如果 URL 发生变化，记录日志
             if current_url != last_url:
-                self.logger.info(f"页面 URL 变化: {last_url} -> {current_url}")
+                self.logger.info("页面 URL 变化: %s -> %s", last_url, current_url)
                 last_url = current_url
-            
-            # 等待一段时间后再次检查
-            await asyncio.sleep(check_interval)
+            if target_matcher is not None:
+                return target_matcher.match(current_url) is not None
+            return is_target_url(current_url, target_urls)
+        
+        try:
+            # 由 Playwright 在主框架每次导航时回调判断，不再定时轮询
+            await page.wait_for_url(matches_target, timeout=timeout)
+        except PlaywrightTimeoutError:
+            self.logger.warning(
+                f"⏰ 等待页面跳转超时 ({timeout}ms)，当前 URL: {page.url}"
+            )
+            # 超时后返回当前页面
+            return page
+        
+        self.logger.info("✅ 页面已跳转到目标 URL: %s", page.url)
+        return page
     
     async def close(self) -> None:
         """关闭浏览器会话"""
-        if self.browser:
+        # 关闭页面池中的空闲页面
+        while self._idle_pages:
+            page = self._idle_pages.pop()
             try:
-                await self.browser.close()
-                self.logger.debug("浏览器会话已关闭")
+                await page.close()
             except Exception as e:
-                self.logger.warning(f"关闭浏览器会话时出错: {e}")
-            finally:
-                self.browser = None
+                self.logger.warning(f"关闭空闲页面时出错: {e}")
         
-        if self.playwright:
+        # 先释放上下文池中创建的上下文（默认上下文属于用户浏览器，不关闭）
+        for context in self._discard_context_pool():
             try:
-                await self.playwright.stop()
-                self.logger.debug("Playwright 已停止")
+                await context.close()
             except Exception as e:
-                self.logger.warning(f"停止 Playwright 时出错: {e}")
-            finally:
-                self.playwright = None
+                self.logger.warning(f"关闭浏览器上下文时出错: {e}")
+        
+        # CDP 连接由浏览器管理器持有（可能被其他会话共享），这里只释放引用，
+        # 由 browser_manager.disconnect() 统一断开
+        self.browser = None
+        self.context = None
+        self.logger.debug("浏览器会话已关闭")
     
     async def __aenter__(self):
         """异步上下文管理器入口"""
@@ -4,10 +4,9 @@
 """
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Optional
 
 
-@dataclass
+@dataclass(slots=True)
 class CaptureResult:
     """捕获结果数据类"""
     url: str
@@ -17,15 +16,12 @@ class CaptureResult:
     
     def __post_init__(self):
         """初始化后处理"""
-        # 确保 timestamp 是 datetime 类型
-        if isinstance(self.timestamp, str):
-            # 如果是字符串，尝试解析
+        # 确保 timestamp 是 datetime 类型（字符串按 ISO 格式解析，无法解析时使用当前时间）
+        if not isinstance(self.timestamp, datetime):
             try:
                 self.timestamp = datetime.fromisoformat(self.timestamp)
-            except (ValueError, AttributeError):
+            except (TypeError, ValueError):
                 self.timestamp = datetime.now()
-        elif not isinstance(self.timestamp, datetime):
-            self.timestamp = datetime.now()
     
     def to_dict(self) -> dict:
         """
@@ -2,27 +2,62 @@
 页面内容保存器
 负责保存页面的 HTML 内容和截图
 """
-import sys
 import re
+import base64
+import asyncio
 import logging
+from functools import lru_cache
 from pathlib import Path
 from datetime import datetime
 from typing import Optional
 from playwright.async_api import Page
 from urllib.parse import urlparse
 
-# 添加 utils 目录到路径
-utils_path = Path(__file__).parent.parent.parent / "utils"
-if str(utils_path) not in sys.path:
-    sys.path.insert(0, str(utils_path))
+try:
+    import oxipng
+except ImportError:
+    # oxipng 为可选依赖，未安装时直接保存浏览器输出的 PNG
+    oxipng = None
 
-# 添加 Web_analys 目录到路径
-web_analys_dir = Path(__file__).parent.parent
-if str(web_analys_dir) not in sys.path:
-    sys.path.insert(0, str(web_analys_dir))
+from utils.url_utils import url_to_folder_name, url_to_subfolder_name
+from .exceptions import SaveError
 
-from url_utils import url_to_folder_name, url_to_subfolder_name
-from core.exceptions import SaveError
+# CDP 单次截图的最大页面高度（像素），超过时回退到 Playwright 的分块截图
+CDP_MAX_CAPTURE_HEIGHT = 8192
+
+# 精简 HTML 的脚本：移除外部脚本引用、预加载链接和内联的 data: 图片
+# 注意保留内联脚本，课程信息等数据（ENV、课程 JSON）都在其中，后续解析依赖它们
+STRIP_HTML_SCRIPT = """
+() => {
+    const root = document.documentElement.cloneNode(true);
+    root.querySelectorAll(
+        'script[src], link[rel="preload"], link[rel="prefetch"], style[data-analytics]'
+    ).forEach(node => node.remove());
+    root.querySelectorAll('img[src^="data:"]').forEach(node => node.removeAttribute('src'));
+    const doctype = document.doctype ? '<!DOCTYPE ' + document.doctype.name + '>' : '';
+    return doctype + root.outerHTML;
+}
+"""
+
+# 文件夹名中不允许出现的字符
+INVALID_FOLDER_CHARS_RE = re.compile(r'[<>:"/\\|?*\x00-\x1f]')
+# assignments 页面 URL 中的课程 ID（/courses/数字/assignments）
+COURSE_ASSIGNMENTS_RE = re.compile(r'/courses/(\d+)/assignments')
+
+
+@lru_cache(maxsize=1024)
+def _sanitize_folder_name(name: str, max_length: int = 100) -> str:
+    """
+    清理文件夹名称：替换非法字符并限制长度（纯函数，结果按名称缓存）
+    
+    Args:
+        name: 原始名称（如课程名称或 assignment ID）
+        max_length: 最大长度限制
+        
+    Returns:
+        str: 可用作文件夹名的名称
+    """
+    return INVALID_FOLDER_CHARS_RE.sub('_', name)[:max_length]
 
 
 class PageSaver:
@@ -31,7 +66,10 @@ class PageSaver:
     def __init__(
         self,
         output_dir: str,
-        logger: Optional[logging.Logger] = None
+        logger: Optional[logging.Logger] = None,
+        screenshot_format: str = "jpeg",
+        jpeg_quality: int = 80,
+        strip_html: bool = False
     ):
         """
         初始化页面保存器
@@ -39,20 +77,41 @@ class PageSaver:
         Args:
             output_dir: 输出目录
             logger: 日志记录器
+            screenshot_format: 截图格式，"jpeg"（默认，体积小、编码快）或 "png"（无损）
+            jpeg_quality: JPEG 截图质量（0-100）
+            strip_html: 是否在保存前精简 HTML（移除外部脚本、预加载链接和 data: 图片）
         """
         self.output_dir = Path(output_dir)
         self.logger = logger or logging.getLogger("page_saver")
+        self.screenshot_format = "jpeg" if screenshot_format.lower() in ("jpeg", "jpg") else "png"
+        self.jpeg_quality = jpeg_quality
+        self.strip_html = strip_html
+        
+        # 已确认存在的目录，同一目录只调用一次 mkdir
+        self._created_dirs: set[Path] = set()
         
         # 确保输出目录存在
-        self.output_dir.mkdir(parents=True, exist_ok=True)
+        self._ensure_dir(self.output_dir)
+    
+    def _ensure_dir(self, directory: Path) -> None:
+        """
+        确保目录存在（已创建过的目录直接跳过，不再重复调用 mkdir）
+        
+        Args:
+            directory: 目录路径
+        """
+        if directory not in self._created_dirs:
+            directory.mkdir(parents=True, exist_ok=True)
+            self._created_dirs.add(directory)
     
     def generate_file_paths(
         self, 
         url: str, 
         timestamp: Optional[datetime] = None,
         parent_html_file: Optional[str] = None,
-        course_name: Optional[str] = None
-    ) -> tuple[str, str]:
+        course_name: Optional[str] = None,
+        url_path: Optional[str] = None
+    ) -> tuple[Path, Path]:
         """
         生成 HTML 和截图文件路径
         
@@ -61,6 +120,7 @@ class PageSaver:
             timestamp: 时间戳，如果为 None 则使用当前时间
             parent_html_file: 父级 HTML 文件路径（如果提供，则在父级目录下创建子文件夹，实现层级结构）
             course_name: 课程名称（如果提供，使用课程名称作为文件夹名，而不是 URL）
+            url_path: 已解析出的 URL 路径（可选，调用方已解析过 URL 时传入，避免重复解析）
             
         Returns:
             (html_path, screenshot_path): HTML 和截图文件路径元组
@@ -79,47 +139,42 @@ class PageSaver:
             
             # 如果提供了课程名称，使用课程名称作为文件夹名
             if course_name:
-                # 清理课程名称，移除非法字符
-                safe_course_name = re.sub(r'[<>:"/\\|?*\x00-\x1f]', '_', course_name)
-                # 限制长度
-                if len(safe_course_name) > 100:
-                    safe_course_name = safe_course_name[:100]
-                subfolder_name = safe_course_name
-                self.logger.debug(f"使用课程名称作为文件夹名: {subfolder_name}")
+                # 清理课程名称，移除非法字符并限制长度
+                subfolder_name = _sanitize_folder_name(course_name)
+                self.logger.debug("使用课程名称作为文件夹名: %s", subfolder_name)
             else:
-                # 从 URL 提取子文件夹名称
-                subfolder_name = url_to_subfolder_name(url)
-                self.logger.debug(f"未提供课程名称，从 URL 提取文件夹名: {subfolder_name}")
-                # 如果 URL 包含 /assignments，尝试从课程 URL 中提取课程 ID
+                # 如果 URL 包含 /assignments，优先从课程 URL 中提取课程 ID
+                # （/courses/123/assignments -> course_123），仅在提取不到时才从 URL 生成文件夹名
+                match = None
                 if '/assignments' in url:
-                    parsed = urlparse(url)
-                    # 尝试提取课程 ID（/courses/123/assignments -> course_123）
-                    match = re.search(r'/courses/(\d+)/assignments', parsed.path)
-                    if match:
-                        course_id = match.group(1)
-                        subfolder_name = f"course_{course_id}"
-                        self.logger.debug(f"从 URL 提取课程 ID，使用文件夹名: {subfolder_name}")
+                    match = COURSE_ASSIGNMENTS_RE.search(
+                        url_path if url_path is not None else urlparse(url).path
+                    )
+                if match:
+                    subfolder_name = f"course_{match.group(1)}"
+                    self.logger.debug("从 URL 提取课程 ID，使用文件夹名: %s", subfolder_name)
+                else:
+                    subfolder_name = url_to_subfolder_name(url)
+                    self.logger.debug("未提供课程名称，从 URL 提取文件夹名: %s", subfolder_name)
             url_dir = parent_dir / subfolder_name
         else:
             # 扁平结构：根据 URL 或课程名称创建文件夹
             if course_name:
-                safe_course_name = re.sub(r'[<>:"/\\|?*\x00-\x1f]', '_', course_name)
-                if len(safe_course_name) > 100:
-                    safe_course_name = safe_course_name[:100]
-                folder_name = safe_course_name
+                folder_name = _sanitize_folder_name(course_name)
             else:
                 folder_name = url_to_folder_name(url)
             url_dir = self.output_dir / folder_name
         
-        url_dir.mkdir(parents=True, exist_ok=True)
+        self._ensure_dir(url_dir)
         
         # 生成文件路径
         html_path = url_dir / f"{timestamp_str}.html"
-        screenshot_path = url_dir / f"{timestamp_str}.png"
+        screenshot_ext = "jpg" if self.screenshot_format == "jpeg" else "png"
+        screenshot_path = url_dir / f"{timestamp_str}.{screenshot_ext}"
         
-        return str(html_path), str(screenshot_path)
+        return html_path, screenshot_path
     
-    async def save_html(self, page: Page, html_path: str) -> str:
+    async def save_html(self, page: Page, html_path: Path) -> Path:
         """
         保存页面 HTML
         
@@ -134,28 +189,29 @@ class PageSaver:
             SaveError: 保存失败
         """
         try:
-            # 获取 HTML 内容
-            html_content = await page.content()
+            # 获取 HTML 内容（开启精简时在页面内完成裁剪，减少传输和写入的数据量）
+            if self.strip_html:
+                html_content = await page.evaluate(STRIP_HTML_SCRIPT)
+            else:
+                html_content = await page.content()
             
-            # 保存到文件
-            html_file = Path(html_path)
-            html_file.parent.mkdir(parents=True, exist_ok=True)
+            # 保存到文件（大文件写入放到线程池中，避免阻塞事件循环）
+            self._ensure_dir(html_path.parent)
             
-            with open(html_file, 'w', encoding='utf-8') as f:
-                f.write(html_content)
+            await asyncio.to_thread(html_path.write_text, html_content, encoding='utf-8')
             
-            self.logger.info(f"✅ HTML 已保存: {html_path}")
-            return str(html_path)
+            self.logger.info("✅ HTML 已保存: %s", html_path)
+            return html_path
             
         except Exception as e:
-            raise SaveError(html_path, f"保存 HTML 失败: {str(e)}") from e
+            raise SaveError(str(html_path), f"保存 HTML 失败: {str(e)}") from e
     
     async def save_screenshot(
         self,
         page: Page,
-        screenshot_path: str,
+        screenshot_path: Path,
         full_page: bool = True
-    ) -> str:
+    ) -> Path:
         """
         保存页面截图
         
@@ -172,15 +228,66 @@ class PageSaver:
         """
         try:
             # 确保目录存在
-            screenshot_file = Path(screenshot_path)
-            screenshot_file.parent.mkdir(parents=True, exist_ok=True)
+            self._ensure_dir(screenshot_path.parent)
+            
+            # 保存截图（整页截图优先走 CDP 快速路径，失败时回退到 Playwright 截图）
+            data = await self._capture_full_page_via_cdp(page) if full_page else None
+            if data is None:
+                # 两种方式都只获取图片数据，统一在本地写入文件
+                options = {'type': self.screenshot_format}
+                if self.screenshot_format == "jpeg":
+                    options['quality'] = self.jpeg_quality
+                data = await page.screenshot(full_page=full_page, **options)
             
-            # 保存截图
-            await page.screenshot(path=str(screenshot_path), full_page=full_page)
+            # PNG 截图在安装了 oxipng 时先进行无损压缩（CPU 密集操作，放到线程池中执行）
+            if self.screenshot_format == "png" and oxipng is not None:
+                data = await asyncio.to_thread(oxipng.optimize_from_memory, data)
+            await asyncio.to_thread(screenshot_path.write_bytes, data)
             
-            self.logger.info(f"✅ 截图已保存: {screenshot_path}")
-            return str(screenshot_path)
+            self.logger.info("✅ 截图已保存: %s", screenshot_path)
+            return screenshot_path
             
         except Exception as e:
-            raise SaveError(screenshot_path, f"保存截图失败: {str(e)}") from e
+            raise SaveError(str(screenshot_path), f"保存截图失败: {str(e)}") from e
+    
+    async def _capture_full_page_via_cdp(self, page: Page) -> Optional[bytes]:
+        """
+        通过 CDP Page.captureScreenshot 截取整个页面
+        直接截取视口以外的区域，避免 Playwright 整页截图时调整视口、滚动和拼接的开销
+        
+        Args:
+            page: Playwright Page 对象
+        
+        Returns:
+            Optional[bytes]: 图片数据，页面过高或 CDP 不可用时返回 None
+        """
+        try:
+            width, height = await page.evaluate(
+                "() => [document.documentElement.scrollWidth, document.documentElement.scrollHeight]"
+            )
+            if not width or not height or height > CDP_MAX_CAPTURE_HEIGHT:
+                return None
+            
+            params = {
+                'format': self.screenshot_format,
+                'captureBeyondViewport': True,
+                'optimizeForSpeed': True,
+                'fromSurface': True,
+                'clip': {'x': 0, 'y': 0, 'width': width, 'height': height, 'scale': 1}
+            }
+            if self.screenshot_format == "jpeg":
+                params['quality'] = self.jpeg_quality
+            
+            client = await page.context.new_cdp_session(page)
+            try:
+                response = await client.send('Page.captureScreenshot', params)
+            finally:
+                await client.detach()
+            
+            # base64 解码是 CPU 密集操作，放到线程池中执行
+            return await asyncio.to_thread(base64.b64decode, response['data'])
+        
+        except Exception as e:
+            self.logger.debug("CDP 截图失败，回退到 Playwright 截图: %s", e)
+            return None
 
@@ -2,23 +2,17 @@
 URL 捕获服务
 高级接口，整合浏览器会话和页面保存功能
 """
-import sys
+import asyncio
 import logging
-from pathlib import Path
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
-from urllib.parse import urlparse
+from urllib.parse import ParseResult, urlparse
 
-# 添加 Web_analys 目录到路径
-web_analys_dir = Path(__file__).parent.parent
-if str(web_analys_dir) not in sys.path:
-    sys.path.insert(0, str(web_analys_dir))
-
-from BrowserManager.base_manager import BaseBrowserManager
-from core.browser_session import BrowserSession
-from core.page_saver import PageSaver
-from core.capture_result import CaptureResult
-from core.exceptions import WebAnalysError, BrowserNotRunningError, PageLoadError, SaveError
+from ..BrowserManager.base_manager import BaseBrowserManager
+from .browser_session import BrowserSession
+from .page_saver import PageSaver
+from .capture_result import CaptureResult
+from .exceptions import WebAnalysError, BrowserNotRunningError, PageLoadError, SaveError
 
 
 class URLCaptureService:
@@ -43,13 +37,52 @@ class URLCaptureService:
         self.browser_manager = browser_manager
         self.output_dir = output_dir
         self.logger = logger or logging.getLogger("url_capture_service")
-        self.page_saver = page_saver or PageSaver(output_dir, self.logger)
+        self.page_saver = page_saver or PageSaver(
+            output_dir,
+            self.logger,
+            screenshot_format=browser_manager.config.get('screenshot_format', 'jpeg'),
+            jpeg_quality=browser_manager.config.get('jpeg_quality', 80),
+            strip_html=browser_manager.config.get('strip_html', False)
+        )
+        # 浏览器会话在首次捕获时创建，之后所有捕获复用同一个 CDP 连接，直到调用 close()
+        self._session: Optional[BrowserSession] = None
+    
+    def _get_session(self) -> BrowserSession:
+        """
+        获取共享的浏览器会话（懒加载）
+        
+        Returns:
+            BrowserSession: 浏览器会话
+        """
+        if self._session is None:
+            self._session = BrowserSession(self.browser_manager, self.logger)
+        return self._session
+    
+    async def close(self) -> None:
+        """关闭共享的浏览器会话"""
+        if self._session is not None:
+            session, self._session = self._session, None
+            try:
+                await session.close()
+                self.logger.debug("浏览器会话已关闭")
+            except Exception as e:
+                self.logger.warning(f"关闭会话时出错: {e}")
+    
+    async def __aenter__(self):
+        """异步上下文管理器入口"""
+        return self
+    
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """异步上下文管理器退出"""
+        await self.close()
     
     async def capture_url(
         self,
         url: str,
         wait_for_load: bool = True,
-        wait_timeout: int = 10000
+        wait_timeout: int = 10000,
+        parent_html_file: Optional[str] = None,
+        course_name: Optional[str] = None
     ) -> Optional[CaptureResult]:
         """
         捕获指定 URL 的 HTML 和截图
@@ -58,6 +91,8 @@ class URLCaptureService:
             url: 要捕获的 URL
             wait_for_load: 是否等待页面加载完成
             wait_timeout: 等待超时时间（毫秒）
+            parent_html_file: 父级 HTML 文件路径（用于生成层级结构）
+            course_name: 文件夹名称（如课程名称或 assignment ID）
             
         Returns:
             Optional[CaptureResult]: 捕获结果，如果页面被重定向到其他页面则返回 None
@@ -68,15 +103,16 @@ class URLCaptureService:
             SaveError: 保存失败
         """
         timestamp = datetime.now()
-        session = None
         page = None
+        # 原始 URL 只解析一次，重定向检查和路径生成共用解析结果
+        parsed_url = urlparse(url)
         
         try:
-            # 创建浏览器会话
-            session = BrowserSession(self.browser_manager, self.logger)
+            # 获取共享的浏览器会话（连接在多次捕获之间复用）
+            session = self._get_session()
             
             # 打开 URL（启用跳转监控）
-            self.logger.info(f"开始捕获 URL: {url}")
+            self.logger.info("开始捕获 URL: %s", url)
             redirect_timeout = self.browser_manager.config.get('redirect_timeout', 30000)
             page = await session.open_url(
                 url, 
@@ -88,132 +124,177 @@ class URLCaptureService:
             
             # 检查页面是否被重定向到其他页面
             current_url = page.url
-            parsed_original = urlparse(url)
-            parsed_current = urlparse(current_url)
-            
-            # 如果域名发生变化，说明被重定向了
-            if parsed_current.netloc != parsed_original.netloc:
-                self.logger.warning(f"⚠️  页面被重定向到不同域名: {url} -> {current_url}，放弃保存")
-                await page.close()
-                await session.close()
-                return None
-            
-            # 检查路径是否发生变化（去掉尾部的斜杠进行比较）
-            original_path = parsed_original.path.rstrip('/')
-            current_path = parsed_current.path.rstrip('/')
-            
-            # 如果路径完全不同，说明被重定向了
-            # 但允许路径包含原始路径（如 /courses/123/assignments 可能跳转到 /courses/123/assignments/456）
-            if original_path and current_path and not current_path.startswith(original_path):
-                self.logger.warning(f"⚠️  页面被重定向到不同路径: {url} -> {current_url}，放弃保存")
-                await page.close()
-                await session.close()
-                return None
-            
-            # 如果原始路径是 /assignments 但当前路径不包含 /assignments，说明被重定向了
-            if '/assignments' in original_path and '/assignments' not in current_path:
-                self.logger.warning(f"⚠️  页面被重定向离开 assignments: {url} -> {current_url}，放弃保存")
-                await page.close()
-                await session.close()
+            redirect_reason = self._get_redirect_reason(parsed_url, urlparse(current_url))
+            if redirect_reason:
+                self.logger.warning(f"⚠️  页面被重定向{redirect_reason}: {url} -> {current_url}，放弃保存")
+                await session.release_page(page)
                 return None
             
-            # 生成文件路径（支持层级结构和课程名称）
-            parent_html_file = getattr(self, '_parent_html_file', None)
-            course_name = getattr(self, '_course_name', None)
-            
             # 调试日志
             if parent_html_file:
-                self.logger.debug(f"父级 HTML 文件: {parent_html_file}")
+                self.logger.debug("父级 HTML 文件: %s", parent_html_file)
             if course_name:
-                self.logger.debug(f"课程名称: {course_name}")
+                self.logger.debug("课程名称: %s", course_name)
             else:
                 self.logger.debug("未设置课程名称")
             
+            # 生成文件路径（支持层级结构和课程名称）
             html_path, screenshot_path = self.page_saver.generate_file_paths(
                 url, 
                 timestamp,
                 parent_html_file=parent_html_file,
-                course_name=course_name
+                course_name=course_name,
+                url_path=parsed_url.path
             )
             
-            self.logger.debug(f"生成的文件路径 - HTML: {html_path}, 截图: {screenshot_path}")
+            self.logger.debug("生成的文件路径 - HTML: %s, 截图: %s", html_path, screenshot_path)
             
-            # 保存 HTML
-            try:
-                html_file = await self.page_saver.save_html(page, html_path)
-            except SaveError as e:
-                self.logger.error(f"❌ 保存 HTML 失败: {e}")
-                raise
+            # HTML 和截图是两个相互独立的 CDP 调用，同时进行
+            html_task = asyncio.create_task(self.page_saver.save_html(page, html_path))
+            screenshot_task = asyncio.create_task(
+                self.page_saver.save_screenshot(page, screenshot_path)
+            )
             
-            # 保存截图
             try:
-                screenshot_file = await self.page_saver.save_screenshot(page, screenshot_path)
-            except SaveError as e:
-                self.logger.error(f"❌ 保存截图失败: {e}")
-                # HTML 已保存，但截图失败，仍然返回结果（但截图路径可能无效）
-                screenshot_file = screenshot_path
-                raise
-            
-            # 创建结果对象（使用实际打开的 URL）
+                # 保存 HTML
+                try:
+                    html_file = await html_task
+                except SaveError as e:
+                    self.logger.error(f"❌ 保存 HTML 失败: {e}")
+                    raise
+                
+                # 保存截图
+                try:
+                    screenshot_file = await screenshot_task
+                except SaveError as e:
+                    self.logger.error(f"❌ 保存截图失败: {e}")
+                    raise
+            finally:
+                # 任一步失败或捕获本身被取消时，先取消并等待仍在运行的任务结束，再由外层关闭页面
+                for task in (html_task, screenshot_task):
+                    if not task.done():
+                        task.cancel()
+                await asyncio.gather(html_task, screenshot_task, return_exceptions=True)
+            
+            # 创建结果对象（使用实际打开的 URL，路径在此处统一转换为字符串）
             result = CaptureResult(
                 url=current_url,
-                html_file=html_file,
-                screenshot_file=screenshot_file,
+                html_file=str(html_file),
+                screenshot_file=str(screenshot_file),
                 timestamp=timestamp
             )
             
-            self.logger.info(f"✅ 捕获完成: {url}")
-            self.logger.info(f"   HTML: {html_file}")
-            self.logger.info(f"   截图: {screenshot_file}")
+            self.logger.info("✅ 捕获完成: %s", url)
+            self.logger.info("   HTML: %s", result.html_file)
+            self.logger.info("   截图: %s", result.screenshot_file)
             
-            # 关闭页面和会话
+            # 释放页面（会话保持打开，供后续捕获复用；启用页面池时页面也会被复用）
             if page:
                 try:
-                    await page.close()
-                    self.logger.debug("页面已关闭")
+                    await session.release_page(page)
+                    self.logger.debug("页面已释放")
                 except Exception as e:
                     self.logger.warning(f"关闭页面时出错: {e}")
             
-            if session:
-                try:
-                    await session.close()
-                    self.logger.debug("浏览器会话已关闭")
-                except Exception as e:
-                    self.logger.warning(f"关闭会话时出错: {e}")
-            
             return result
             
         except (BrowserNotRunningError, PageLoadError, SaveError):
-            # 发生异常时，始终清理资源
+            # 发生异常时，始终清理页面
             if page:
                 try:
                     await page.close()
                 except Exception as e:
                     self.logger.warning(f"关闭页面时出错: {e}")
             
-            if session:
-                try:
-                    await session.close()
-                except Exception as e:
-                    self.logger.warning(f"关闭会话时出错: {e}")
-            
             # 重新抛出已知异常
             raise
         except Exception as e:
-            # 发生未知异常时，清理资源
+            # 发生未知异常时，清理页面
             if page:
                 try:
                     await page.close()
                 except Exception:
                     pass
             
-            if session:
-                try:
-                    await session.close()
-                except Exception:
-                    pass
-            
             # 包装其他异常
             self.logger.error(f"❌ 捕获 URL 时发生未知错误: {str(e)}")
             raise WebAnalysError(f"捕获 URL 失败: {str(e)}") from e
+    
+    async def capture_many(
+        self,
+        urls: List[str],
+        max_concurrency: Optional[int] = None,
+        parent_html_file: Optional[str] = None,
+        course_name: Optional[str] = None
+    ) -> List[Optional[CaptureResult]]:
+        """
+        并发捕获多个 URL（共享同一个浏览器会话，每个 URL 打开独立的页面）
+        
+        Args:
+            urls: 要捕获的 URL 列表
+            max_concurrency: 同时捕获的 URL 数量上限（默认读取配置 max_concurrency，否则为 5）
+            parent_html_file: 父级 HTML 文件路径（用于生成层级结构）
+            course_name: 文件夹名称（如课程名称或 assignment ID）
+            
+        Returns:
+            List[Optional[CaptureResult]]: 与 urls 顺序一致的捕获结果，被重定向或捕获失败的 URL 对应 None
+        """
+        if not urls:
+            return []
+        
+        semaphore = asyncio.Semaphore(
+            max_concurrency or self.browser_manager.config.get('max_concurrency', 5)
+        )
+        total = len(urls)
+        
+        async def capture_one(index: int, url: str) -> Optional[CaptureResult]:
+            async with semaphore:
+                try:
+                    return await self.capture_url(
+                        url,
+                        parent_html_file=parent_html_file,
+                        course_name=course_name
+                    )
+                except Exception as e:
+                    # 单个 URL 失败不影响其他 URL
+                    self.logger.error(f"❌ [{index}/{total}] 捕获 URL 时出错: {url}, {e}", exc_info=True)
+                    return None
+        
+        return await asyncio.gather(
+            *(capture_one(i, url) for i, url in enumerate(urls, 1))
+        )
+    
+    @staticmethod
+    def _get_redirect_reason(
+        parsed_original: ParseResult,
+        parsed_current: ParseResult
+    ) -> Optional[str]:
+        """
+        判断页面是否被重定向到其他页面（依次检查域名和路径）
+        
+        Args:
+            parsed_original: 原始打开的 URL（已解析）
+            parsed_current: 当前页面 URL（已解析）
+        
+        Returns:
+            Optional[str]: 重定向原因描述，未被重定向时返回 None
+        """
+        # 如果域名发生变化，说明被重定向了
+        if parsed_current.netloc != parsed_original.netloc:
+            return "到不同域名"
+        
+        # 检查路径是否发生变化（去掉尾部的斜杠进行比较）
+        original_path = parsed_original.path.rstrip('/')
+        current_path = parsed_current.path.rstrip('/')
+        
+        # 如果路径完全不同，说明被重定向了
+        # 但允许路径包含原始路径（如 /courses/123/assignments 可能跳转到 /courses/123/assignments/456）
+        if original_path and current_path and not current_path.startswith(original_path):
+            return "到不同路径"
+        
+        # 如果原始路径是 /assignments 但当前路径不包含 /assignments，说明被重定向了
+        if '/assignments' in original_path and '/assignments' not in current_path:
+            return "离开 assignments"
+        
+        return None
 
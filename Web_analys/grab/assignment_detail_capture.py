@@ -2,23 +2,112 @@
 Assignment 详情捕获服务
 从 assignments 页面的 HTML 中提取 assignment 详情链接，并批量捕获
 """
-import sys
+import os
 import re
+import html
+import mmap
+import shutil
 import asyncio
 import logging
 from pathlib import Path
 from typing import List, Optional
 from urllib.parse import urlparse, urljoin
 
-# 添加 Web_analys 目录到路径
-web_analys_dir = Path(__file__).parent.parent
-if str(web_analys_dir) not in sys.path:
-    sys.path.insert(0, str(web_analys_dir))
+from ..BrowserManager.base_manager import BaseBrowserManager
+from ..core.url_capture_service import URLCaptureService
+from ..core.capture_result import CaptureResult
+from .course_url_extractor import HTML_PARSER, read_html_file
 
-from BrowserManager.base_manager import BaseBrowserManager
-from core.url_capture_service import URLCaptureService
-from core.capture_result import CaptureResult
-from bs4 import BeautifulSoup
+# 日志分隔线
+_SEP = "=" * 60
+
+# assignment 详情链接（/courses/数字/assignments/数字）
+ASSIGNMENT_URL_RE = re.compile(r'/courses/(\d+)/assignments/(\d+)')
+# assignment 详情 URL 末尾的 assignment ID
+ASSIGNMENT_ID_RE = re.compile(r'/assignments/(\d+)$')
+# 绝对地址链接
+HTTP_HREF_RE = re.compile(r'^http')
+
+# assignments 页面的标志（即将到期的 assignment 分组 ID）
+ASSIGNMENT_GROUP_MARKER = b'assignment_group_upcoming_assignments'
+
+# 以下正则直接在文件字节上扫描（mmap），不构建 DOM
+# 即将到期的 assignment 分组的 id 属性
+ASSIGNMENT_GROUP_RE = re.compile(rb'\sid="assignment_group_upcoming_assignments"')
+# div 的开始和结束标签（用于按嵌套层级找到分组真正的结束位置）
+DIV_TAG_BYTES_RE = re.compile(rb'<(/?)div[\s>/]', re.IGNORECASE)
+# assignment 详情链接（/courses/数字/assignments/数字）
+ASSIGNMENT_URL_BYTES_RE = re.compile(rb'/courses/(\d+)/assignments/(\d+)')
+# 链接地址、<base> 标签地址和绝对地址链接
+HREF_BYTES_RE = re.compile(rb'<a\s(?:[^>]*?\s)?href="([^"]*)"')
+BASE_TAG_BYTES_RE = re.compile(rb'<base\s(?:[^>]*?\s)?href="([^"]+)"')
+ABSOLUTE_HREF_BYTES_RE = re.compile(rb'<a\s(?:[^>]*?\s)?href="(https?://[^"]*)"')
+
+# capture_all_from_output_dir 默认的文件匹配模式（所有 course_* 文件夹下的 HTML 文件）
+DEFAULT_COURSE_HTML_PATTERN = "**/course_*/**/*.html"
+
+
+def _href_to_assignment_url(href: str, base_url: Optional[str]) -> Optional[str]:
+    """
+    将分组内链接的 href 转换为 assignment 详情 URL（快速扫描和 BeautifulSoup 解析共用）
+    
+    Args:
+        href: 链接地址（已反转义）
+        base_url: 基础 URL（可能为 None）
+        
+    Returns:
+        Optional[str]: 完整 URL（保留原有的查询参数等后缀），不是 assignment 链接或无法补全时返回 None
+    """
+    # 匹配 /courses/数字/assignments/数字 格式
+    if not ASSIGNMENT_URL_RE.search(href):
+        return None
+    if href.startswith('http'):
+        return href
+    # 相对路径：有基础 URL 时拼接完整 URL，否则只保留以 / 开头的路径
+    if base_url:
+        return urljoin(base_url, href)
+    return href if href.startswith('/') else None
+
+
+def _canonical_assignment_url(course_id: str, assignment_id: str, base_url: Optional[str]) -> str:
+    """
+    根据课程 ID 和 assignment ID 生成规范的 assignment 详情 URL（快速扫描和 BeautifulSoup 解析共用）
+    
+    Args:
+        course_id: 课程 ID
+        assignment_id: assignment ID
+        base_url: 基础 URL（可能为 None）
+        
+    Returns:
+        str: 规范 URL（{base_url}/courses/课程ID/assignments/assignmentID）
+    """
+    prefix = base_url.rstrip('/') if base_url else ''
+    return f"{prefix}/courses/{course_id}/assignments/{assignment_id}"
+
+
+def _iter_course_html(directory: str, in_course: bool = False):
+    """
+    递归查找 course_* 文件夹下的所有 HTML 文件（等价于 glob("**/course_*/**/*.html")）
+    
+    基于 os.scandir 遍历，直接使用目录项缓存的类型信息，不为每个条目创建 Path 对象或重复 stat；
+    课程文件夹可能嵌套在 dashboard 文件夹下，因此所有子目录都会进入，但只返回 course_* 文件夹内的文件
+    
+    Args:
+        directory: 要遍历的目录
+        in_course: 当前目录是否位于某个 course_* 文件夹内
+    
+    Yields:
+        Path: HTML 文件路径
+    """
+    with os.scandir(directory) as entries:
+        subdirs = []
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                subdirs.append((entry.path, in_course or entry.name.startswith('course_')))
+            elif in_course and entry.name.endswith('.html'):
+                yield Path(entry.path)
+    for subdir, subdir_in_course in subdirs:
+        yield from _iter_course_html(subdir, subdir_in_course)
 
 
 class AssignmentDetailCapture:
@@ -28,7 +117,9 @@ class AssignmentDetailCapture:
         self,
         browser_manager: BaseBrowserManager,
         output_dir: str,
-        logger: Optional[logging.Logger] = None
+        logger: Optional[logging.Logger] = None,
+        max_concurrency: Optional[int] = None,
+        url_capture_service: Optional[URLCaptureService] = None
     ):
         """
         初始化捕获服务
@@ -37,18 +128,27 @@ class AssignmentDetailCapture:
             browser_manager: 浏览器管理器
             output_dir: 输出目录
             logger: 日志记录器
+            max_concurrency: 同时捕获的 assignment 数量上限（默认读取配置 max_concurrency，否则为 5）
+            url_capture_service: URL 捕获服务（可选，传入时与其他服务共享浏览器连接）
         """
         self.browser_manager = browser_manager
         self.output_dir = Path(output_dir)
         self.logger = logger or logging.getLogger(__name__)
+        self.max_concurrency = max_concurrency or browser_manager.config.get('max_concurrency', 5)
+        # 所有 assignments 文件共享同一个信号量，多个文件并行处理时总并发数仍受限
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
         
-        # 创建 URL 捕获服务
-        self.url_capture_service = URLCaptureService(
+        # 创建 URL 捕获服务（未传入时自行创建）
+        self.url_capture_service = url_capture_service or URLCaptureService(
             browser_manager=browser_manager,
             output_dir=str(output_dir),
             logger=self.logger
         )
     
+    async def close(self) -> None:
+        """关闭 URL 捕获服务持有的浏览器会话"""
+        await self.url_capture_service.close()
+    
     def extract_assignment_urls(self, assignments_html_file: str) -> List[str]:
         """
         从 assignments HTML 文件中提取所有 assignment 详情 URL
@@ -63,13 +163,119 @@ class AssignmentDetailCapture:
             self.logger.error(f"❌ HTML 文件不存在: {assignments_html_file}")
             return []
         
+        # 优先直接扫描文件字节，无法确定分组范围或没有找到链接时回退到 BeautifulSoup 解析
+        try:
+            assignment_urls = self._scan_assignment_urls(assignments_html_file)
+        except Exception as e:
+            self.logger.debug("快速扫描 assignment URL 失败，回退到 HTML 解析: %s", e)
+            assignment_urls = None
+        
+        if assignment_urls:
+            self.logger.info(f"✅ 从 HTML 中提取到 {len(assignment_urls)} 个 assignment URL")
+            return assignment_urls
+        
+        return self._parse_assignment_urls(assignments_html_file)
+    
+    def _scan_assignment_urls(self, assignments_html_file: str) -> Optional[List[str]]:
+        """
+        通过 mmap 直接在文件字节上用正则提取 assignment 详情 URL（不构建 DOM）
+        扫描范围为 assignment_group_upcoming_assignments 分组的 div（按嵌套层级找到对应的结束标签），
+        提取结果与 BeautifulSoup 解析相同：分组内链接转换出的 URL，链接中没有找到时再使用分组内容中出现的规范 URL
+        
+        Args:
+            assignments_html_file: assignments HTML 文件路径
+            
+        Returns:
+            Optional[List[str]]: 排序后的 assignment URL 列表，找不到分组或无法确定分组范围时返回 None
+        """
+        with open(assignments_html_file, 'rb') as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return None
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                group = ASSIGNMENT_GROUP_RE.search(mm)
+                if not group:
+                    return None
+                # 分组必须是 div（与 BeautifulSoup 路径的 soup.find('div', id=...) 一致）
+                start = mm.rfind(b'<', 0, group.start())
+                opening = DIV_TAG_BYTES_RE.match(mm, start) if start != -1 else None
+                if not opening or opening.group(1):
+                    return None
+                end = self._find_div_end(mm, start)
+                if end is None:
+                    return None
+                
+                # 提取基础 URL：优先使用分组内第一个链接，其次是 <base> 标签，最后是整个页面的第一个绝对地址链接
+                base_url = None
+                first_href = HREF_BYTES_RE.search(mm, start, end)
+                if first_href and first_href.group(1).startswith(b'http'):
+                    parsed = urlparse(html.unescape(first_href.group(1).decode('utf-8')))
+                    base_url = f"{parsed.scheme}://{parsed.netloc}"
+                if not base_url:
+                    base_tag = BASE_TAG_BYTES_RE.search(mm)
+                    if base_tag:
+                        base_url = html.unescape(base_tag.group(1).decode('utf-8'))
+                    else:
+                        link = ABSOLUTE_HREF_BYTES_RE.search(mm)
+                        if link:
+                            parsed = urlparse(html.unescape(link.group(1).decode('utf-8')))
+                            base_url = f"{parsed.scheme}://{parsed.netloc}"
+                
+                # 分组内链接转换出的 URL（href 在文件中是转义后的形式，先反转义）
+                assignment_urls = set()
+                for href in HREF_BYTES_RE.findall(mm, start, end):
+                    full_url = _href_to_assignment_url(html.unescape(href.decode('utf-8')), base_url)
+                    if full_url:
+                        assignment_urls.add(full_url)
+                
+                # 链接中没有找到时，使用分组内容中出现的规范 URL（与 BeautifulSoup 路径一致）
+                if not assignment_urls:
+                    assignment_urls.update(
+                        _canonical_assignment_url(course_id.decode(), assignment_id.decode(), base_url)
+                        for course_id, assignment_id in ASSIGNMENT_URL_BYTES_RE.findall(mm, start, end)
+                    )
+        
+        return sorted(assignment_urls)
+    
+    @staticmethod
+    def _find_div_end(data: mmap.mmap, start: int) -> Optional[int]:
+        """
+        从 div 开始标签处按嵌套层级查找对应的结束标签位置
+        
+        Args:
+            data: 文件内容
+            start: div 开始标签的位置
+            
+        Returns:
+            Optional[int]: 对应结束标签的位置，标签不配对时返回 None
+        """
+        depth = 0
+        for tag in DIV_TAG_BYTES_RE.finditer(data, start):
+            if tag.group(1):
+                depth -= 1
+                if depth == 0:
+                    return tag.start()
+            else:
+                depth += 1
+        return None
+    
+    def _parse_assignment_urls(self, assignments_html_file: str) -> List[str]:
+        """
+        使用 BeautifulSoup 解析 HTML 并提取 assignment 详情 URL（快速扫描失败时的回退方案）
+        
+        Args:
+            assignments_html_file: assignments HTML 文件路径
+            
+        Returns:
+            List[str]: assignment URL 列表
+        """
         try:
             # 读取 HTML 文件
-            with open(assignments_html_file, 'r', encoding='utf-8') as f:
-                html_content = f.read()
+            html_content = read_html_file(assignments_html_file)
             
-            # 使用 BeautifulSoup 解析
-            soup = BeautifulSoup(html_content, 'html.parser')
+            # 使用 BeautifulSoup 解析（优先使用 lxml 解析器）
+            # 仅在回退时才导入 bs4，快速扫描成功时不需要加载
+            from bs4 import BeautifulSoup
+            soup = BeautifulSoup(html_content, HTML_PARSER)
             
             # 只查找 assignment_group_upcoming_assignments 分组
             assignment_group = soup.find('div', id='assignment_group_upcoming_assignments')
@@ -96,58 +302,28 @@ class AssignmentDetailCapture:
                 if base_tag:
                     base_url = base_tag.get('href')
                 else:
-                    # 从整个 HTML 的链接中提取基础 URL（作为备用）
-                    all_links = soup.find_all('a', href=True)
-                    for link in all_links:
-                        href = link.get('href', '')
-                        if href.startswith('http'):
-                            parsed = urlparse(href)
-                            base_url = f"{parsed.scheme}://{parsed.netloc}"
-                            break
+                    # 从整个 HTML 的第一个绝对地址链接中提取基础 URL（作为备用）
+                    link = soup.find('a', href=HTTP_HREF_RE)
+                    if link:
+                        parsed = urlparse(link['href'])
+                        base_url = f"{parsed.scheme}://{parsed.netloc}"
             
             # 只在 assignment_group_upcoming_assignments 分组下查找所有链接
             assignment_urls = set()
-            assignment_pattern = r'/courses/(\d+)/assignments/(\d+)'
-            
             # 只在这个分组内查找链接
             for link in assignment_group.find_all('a', href=True):
-                href = link.get('href', '')
-                
-                # 匹配 /courses/数字/assignments/数字 格式
-                match = re.search(assignment_pattern, href)
-                if match:
-                    course_id = match.group(1)
-                    assignment_id = match.group(2)
-                    
-                    # 如果是相对路径，构建完整 URL
-                    if href.startswith('/'):
-                        if base_url:
-                            full_url = urljoin(base_url, href)
-                        else:
-                            full_url = href
-                    elif not href.startswith('http'):
-                        if base_url:
-                            full_url = urljoin(base_url, href)
-                        else:
-                            continue
-                    else:
-                        full_url = href
-                    
+                full_url = _href_to_assignment_url(link.get('href', ''), base_url)
+                if full_url:
                     assignment_urls.add(full_url)
-                    self.logger.debug(f"从 assignment_group_upcoming_assignments 提取到 URL: {full_url}")
+                    self.logger.debug("从 assignment_group_upcoming_assignments 提取到 URL: %s", full_url)
             
-            # 也使用正则表达式在整个分组内容中搜索（确保不遗漏）
-            assignment_group_content = str(assignment_group)
-            matches = re.findall(assignment_pattern, assignment_group_content)
-            for match in matches:
-                course_id = match[0]
-                assignment_id = match[1]
-                if base_url:
-                    assignment_url = f"{base_url}/courses/{course_id}/assignments/{assignment_id}"
-                else:
-                    assignment_url = f"/courses/{course_id}/assignments/{assignment_id}"
-                assignment_urls.add(assignment_url)
-                self.logger.debug(f"从分组内容中提取到 URL: {assignment_url}")
+            # 链接中没有找到时，才把整个分组转换为字符串搜索并生成规范 URL（ID 不在 href 中时也不会遗漏）
+            # 分组内容可能有数百 KB，链接中已找到时跳过，避免重复的序列化和正则扫描
+            if not assignment_urls:
+                for course_id, assignment_id in ASSIGNMENT_URL_RE.findall(str(assignment_group)):
+                    assignment_url = _canonical_assignment_url(course_id, assignment_id, base_url)
+                    assignment_urls.add(assignment_url)
+                    self.logger.debug("从分组内容中提取到 URL: %s", assignment_url)
             
             assignment_urls_list = sorted(list(assignment_urls))
             self.logger.info(f"✅ 从 HTML 中提取到 {len(assignment_urls_list)} 个 assignment URL")
@@ -173,11 +349,15 @@ class AssignmentDetailCapture:
         """
         try:
             # 步骤 1: 提取 assignment 详情 URL
-            self.logger.info("\n" + "=" * 60)
+            self.logger.info("\n%s", _SEP)
             self.logger.info("步骤 1: 从 assignments HTML 中提取 assignment 详情 URL")
-            self.logger.info("=" * 60)
+            self.logger.info(_SEP)
             
-            assignment_urls = self.extract_assignment_urls(assignments_html_file)
+            # HTML 解析是 CPU 密集操作，放到线程中执行，避免阻塞其他文件的捕获任务
+            assignment_urls = await asyncio.to_thread(
+                self.extract_assignment_urls,
+                assignments_html_file
+            )
             
             if not assignment_urls:
                 self.logger.warning("⚠️  未提取到 assignment URL")
@@ -185,57 +365,24 @@ class AssignmentDetailCapture:
             
             self.logger.info(f"✅ 提取到 {len(assignment_urls)} 个 assignment URL:")
             for url in assignment_urls:
-                self.logger.info(f"   - {url}")
+                self.logger.info("   - %s", url)
             
             # 步骤 2: 批量捕获 assignment 详情页面
-            self.logger.info("\n" + "=" * 60)
+            self.logger.info("\n%s", _SEP)
             self.logger.info("步骤 2: 批量捕获 assignment 详情页面")
-            self.logger.info("=" * 60)
-            
-            # 获取 assignments HTML 文件的目录（作为父级目录）
-            assignments_path = Path(assignments_html_file)
-            assignments_dir = assignments_path.parent
+            self.logger.info(_SEP)
             
             # 设置父级 HTML 文件路径（用于创建层级结构）
-            parent_html_file = str(assignments_path)
+            parent_html_file = str(Path(assignments_html_file))
             
-            results = []
             total = len(assignment_urls)
             
-            for i, assignment_url in enumerate(assignment_urls, 1):
-                try:
-                    # 从 URL 中提取 assignment ID，用作文件夹名
-                    match = re.search(r'/assignments/(\d+)$', assignment_url)
-                    if match:
-                        assignment_id = match.group(1)
-                        self.logger.info(f"\n[{i}/{total}] 捕获 assignment 详情: {assignment_url}")
-                        self.logger.debug(f"    Assignment ID: {assignment_id}")
-                    else:
-                        self.logger.warning(f"\n[{i}/{total}] 无法从 URL 提取 assignment ID: {assignment_url}")
-                    
-                    # 设置父级 HTML 文件路径（用于生成层级结构）
-                    # 使用 assignment ID 作为子文件夹名
-                    self.url_capture_service._parent_html_file = parent_html_file
-                    # 使用 assignment ID 作为文件夹名
-                    self.url_capture_service._course_name = assignment_id if match else None
-                    
-                    # 捕获 URL
-                    result = await self.url_capture_service.capture_url(assignment_url)
-                    
-                    # 清除父级 HTML 文件路径和文件夹名
-                    if hasattr(self.url_capture_service, '_parent_html_file'):
-                        delattr(self.url_capture_service, '_parent_html_file')
-                    if hasattr(self.url_capture_service, '_course_name'):
-                        delattr(self.url_capture_service, '_course_name')
-                    
-                    if result:
-                        results.append(result)
-                        self.logger.info(f"✅ [{i}/{total}] 捕获成功: {result.html_file}")
-                    else:
-                        self.logger.error(f"❌ [{i}/{total}] 捕获失败")
-                        
-                except Exception as e:
-                    self.logger.error(f"❌ [{i}/{total}] 捕获 assignment 详情时出错: {str(e)}", exc_info=True)
+            # 并发捕获（受信号量限制），gather 按索引顺序返回结果
+            outcomes = await asyncio.gather(*[
+                self._capture_one(i, total, assignment_url, parent_html_file, self._semaphore)
+                for i, assignment_url in enumerate(assignment_urls, 1)
+            ])
+            results = [result for result in outcomes if result]
             
             self.logger.info(f"\n✅ 完成！共捕获 {len(results)}/{total} 个 assignment 详情页面")
             
@@ -245,10 +392,122 @@ class AssignmentDetailCapture:
             self.logger.error(f"❌ 捕获过程中出错: {str(e)}", exc_info=True)
             return []
     
+    async def _capture_one(
+        self,
+        i: int,
+        total: int,
+        assignment_url: str,
+        parent_html_file: str,
+        semaphore: asyncio.Semaphore
+    ) -> Optional[CaptureResult]:
+        """
+        捕获单个 assignment 详情页面
+        
+        Args:
+            i: 序号（从 1 开始）
+            total: 总数
+            assignment_url: assignment 详情 URL
+            parent_html_file: 父级 HTML 文件路径（用于生成层级结构）
+            semaphore: 限制并发数的信号量
+        
+        Returns:
+            Optional[CaptureResult]: 捕获结果，失败时返回 None
+        """
+        # 仅错开第一批任务的启动时间，避免同时向服务器发起大量请求
+        # 之后的任务由信号量自然错开，不再累加固定等待
+        if i <= self.max_concurrency:
+            await asyncio.sleep(0.1 * (i - 1))
+        
+        async with semaphore:
+            try:
+                # 从 URL 中提取 assignment ID，用作文件夹名
+                match = ASSIGNMENT_ID_RE.search(assignment_url)
+                if match:
+                    assignment_id = match.group(1)
+                    self.logger.info("\n[%d/%d] 捕获 assignment 详情: %s", i, total, assignment_url)
+                    self.logger.debug("    Assignment ID: %s", assignment_id)
+                else:
+                    self.logger.warning("\n[%d/%d] 无法从 URL 提取 assignment ID: %s", i, total, assignment_url)
+                
+                # 捕获 URL（使用 assignment ID 作为子文件夹名，参数显式传入以保证并发安全）
+                result = await self.url_capture_service.capture_url(
+                    assignment_url,
+                    parent_html_file=parent_html_file,
+                    course_name=assignment_id if match else None
+                )
+                
+                if result:
+                    self.logger.info("✅ [%d/%d] 捕获成功: %s", i, total, result.html_file)
+                else:
+                    self.logger.error("❌ [%d/%d] 捕获失败", i, total)
+                return result
+            
+            except Exception as e:
+                self.logger.error("❌ [%d/%d] 捕获 assignment 详情时出错: %s", i, total, e, exc_info=True)
+                return None
+    
+    @staticmethod
+    def _file_contains(path: Path, needle: bytes) -> bool:
+        """
+        检查文件中是否包含指定的字节串（通过 mmap 扫描，找到后立即返回）
+        
+        Args:
+            path: 文件路径
+            needle: 要查找的字节串
+            
+        Returns:
+            bool: 文件包含该字节串时返回 True（空文件返回 False）
+        """
+        with open(path, 'rb') as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return False
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                return mm.find(needle) != -1
+    
+    async def _find_files_with_rg(
+        self,
+        output_path: Path,
+        pattern: str,
+        needle: bytes
+    ) -> Optional[List[Path]]:
+        """
+        通过一次 ripgrep 调用筛选出包含指定字节串的文件（rg 内部并行遍历目录并使用 SIMD 查找）
+        
+        Args:
+            output_path: 要搜索的目录
+            pattern: 文件匹配模式（作为 rg 的 --glob 参数）
+            needle: 要查找的字节串
+            
+        Returns:
+            Optional[List[Path]]: 匹配的文件列表（已排序），rg 不可用或执行失败时返回 None
+        """
+        rg_path = shutil.which('rg')
+        if rg_path is None:
+            return None
+        
+        try:
+            process = await asyncio.create_subprocess_exec(
+                rg_path, '-l', '--fixed-strings', '--no-ignore', '--hidden', '--no-messages',
+                '--glob', pattern, needle.decode('ascii'), str(output_path),
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.DEVNULL
+            )
+            stdout, _ = await process.communicate()
+        except OSError as e:
+            self.logger.debug("调用 rg 失败，回退到逐个文件扫描: %s", e)
+            return None
+        
+        # rg 退出码：0 表示有匹配，1 表示没有匹配，其他表示出错
+        if process.returncode not in (0, 1):
+            self.logger.debug("rg 退出码 %s，回退到逐个文件扫描", process.returncode)
+            return None
+        
+        return sorted(Path(line) for line in os.fsdecode(stdout).splitlines() if line)
+    
     async def capture_all_from_output_dir(
         self,
         output_dir: str,
-        pattern: str = "**/course_*/**/*.html"
+        pattern: str = DEFAULT_COURSE_HTML_PATTERN
     ) -> List[CaptureResult]:
         """
         从输出目录中查找所有 assignments HTML 文件，并批量捕获 assignment 详情
@@ -265,20 +524,28 @@ class AssignmentDetailCapture:
             self.logger.error(f"❌ 输出目录不存在: {output_dir}")
             return []
         
-        # 查找所有可能的 assignments HTML 文件
-        # 查找 course_* 文件夹下的所有 HTML 文件
-        html_files = list(output_path.glob(pattern))
-        
-        # 过滤出 assignments 页面（包含 assignment_group_upcoming_assignments）
-        assignments_files = []
-        for html_file in html_files:
-            try:
-                content = html_file.read_text(encoding='utf-8')
-                if 'assignment_group_upcoming_assignments' in content:
-                    assignments_files.append(html_file)
-                    self.logger.debug(f"找到 assignments 文件: {html_file}")
-            except Exception as e:
-                self.logger.warning(f"⚠️  读取文件失败: {html_file}, {str(e)}")
+        # 查找 course_* 文件夹下的所有 HTML 文件，并过滤出 assignments 页面
+        # （包含 assignment_group_upcoming_assignments）
+        # 优先用一次 rg 调用完成查找和过滤
+        assignments_files = await self._find_files_with_rg(
+            output_path, pattern, ASSIGNMENT_GROUP_MARKER
+        )
+        if assignments_files is None:
+            # rg 不可用时逐个文件扫描：通过 mmap 直接在文件字节中查找，不读取和解码整个文件
+            # 默认模式使用基于 os.scandir 的遍历，自定义模式仍使用 glob
+            if pattern == DEFAULT_COURSE_HTML_PATTERN:
+                html_files = _iter_course_html(str(output_path))
+            else:
+                html_files = output_path.glob(pattern)
+            assignments_files = []
+            for html_file in html_files:
+                try:
+                    if self._file_contains(html_file, ASSIGNMENT_GROUP_MARKER):
+                        assignments_files.append(html_file)
+                except Exception as e:
+                    self.logger.warning(f"⚠️  读取文件失败: {html_file}, {str(e)}")
+        for assignments_file in assignments_files:
+            self.logger.debug("找到 assignments 文件: %s", assignments_file)
         
         if not assignments_files:
             self.logger.warning("⚠️  未找到任何 assignments HTML 文件")
@@ -286,11 +553,17 @@ class AssignmentDetailCapture:
         
         self.logger.info(f"✅ 找到 {len(assignments_files)} 个 assignments HTML 文件")
         
-        # 批量处理每个 assignments 文件
-        all_results = []
+        # 并行处理所有 assignments 文件：一个文件等待页面加载时，其他文件的提取和保存可以继续进行
+        # 总并发数由共享的信号量限制，结果按文件顺序合并
         for assignments_file in assignments_files:
-            self.logger.info(f"\n处理文件: {assignments_file}")
-            results = await self.capture_from_assignments_html(str(assignments_file))
+            self.logger.info("处理文件: %s", assignments_file)
+        file_results = await asyncio.gather(*[
+            self.capture_from_assignments_html(str(assignments_file))
+            for assignments_file in assignments_files
+        ])
+        
+        all_results = []
+        for results in file_results:
             all_results.extend(results)
         
         return all_results
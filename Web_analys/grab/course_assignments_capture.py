@@ -2,23 +2,18 @@
 课程 Assignments 捕获服务
 从 dashboard HTML 中提取课程 URL，生成 assignments URL，并批量捕获
 """
-import sys
-import re
-import asyncio
 import logging
 from pathlib import Path
 from typing import List, Optional
-from urllib.parse import urljoin, urlparse
+from urllib.parse import urlparse
 
-# 添加 Web_analys 目录到路径
-web_analys_dir = Path(__file__).parent.parent
-if str(web_analys_dir) not in sys.path:
-    sys.path.insert(0, str(web_analys_dir))
+from ..BrowserManager.base_manager import BaseBrowserManager
+from ..core.url_capture_service import URLCaptureService
+from ..core.capture_result import CaptureResult
+from .course_url_extractor import CourseURLExtractor, HTML_PARSER, read_html_file
 
-from BrowserManager.base_manager import BaseBrowserManager
-from core.url_capture_service import URLCaptureService
-from core.capture_result import CaptureResult
-from grab.course_url_extractor import CourseURLExtractor
+# 日志分隔线
+_SEP = "=" * 60
 
 
 class CourseAssignmentsCapture:
@@ -28,7 +23,8 @@ class CourseAssignmentsCapture:
         self,
         browser_manager: BaseBrowserManager,
         output_dir: str,
-        logger: Optional[logging.Logger] = None
+        logger: Optional[logging.Logger] = None,
+        url_capture_service: Optional[URLCaptureService] = None
     ):
         """
         初始化捕获服务
@@ -37,13 +33,14 @@ class CourseAssignmentsCapture:
             browser_manager: 浏览器管理器
             output_dir: 输出目录
             logger: 日志记录器
+            url_capture_service: URL 捕获服务（可选，传入时与其他服务共享浏览器连接）
         """
         self.browser_manager = browser_manager
         self.output_dir = output_dir
         self.logger = logger or logging.getLogger("course_assignments_capture")
         
-        # 创建 URL 捕获服务
-        self.url_capture_service = URLCaptureService(
+        # 创建 URL 捕获服务（未传入时自行创建）
+        self.url_capture_service = url_capture_service or URLCaptureService(
             browser_manager=browser_manager,
             output_dir=output_dir,
             logger=self.logger
@@ -51,6 +48,34 @@ class CourseAssignmentsCapture:
         
         # 创建课程 URL 提取器
         self.url_extractor = CourseURLExtractor(logger=self.logger)
+        
+        # 基础 URL 在整个运行期间不变，从配置的 dashboard URL 中解析一次
+        self.base_url = self._base_url_from_config(browser_manager.config)
+    
+    async def close(self) -> None:
+        """关闭 URL 捕获服务持有的浏览器会话"""
+        await self.url_capture_service.close()
+    
+    @staticmethod
+    def _base_url_from_config(config: dict) -> Optional[str]:
+        """
+        从配置的 target_urls 中提取基础 URL
+        
+        Args:
+            config: 配置字典
+        
+        Returns:
+            Optional[str]: 基础 URL（如 https://sit.instructure.com），无法解析时返回 None
+        """
+        target_urls = config.get('target_urls') or []
+        if not target_urls or not target_urls[0]:
+            return None
+        
+        parsed = urlparse(target_urls[0])
+        if not parsed.scheme or not parsed.netloc:
+            return None
+        
+        return f"{parsed.scheme}://{parsed.netloc}"
     
     async def capture_from_dashboard_html(
         self,
@@ -62,16 +87,16 @@ class CourseAssignmentsCapture:
         
         Args:
             dashboard_html_file: dashboard HTML 文件路径
-            base_url: 基础 URL（如果不提供，会从 HTML 中提取）
+            base_url: 基础 URL（如果不提供，使用配置的 target_urls 的域名，否则从 HTML 中提取）
             
         Returns:
             List[CaptureResult]: 捕获结果列表
         """
         try:
             # 步骤 1: 提取课程 URL
-            self.logger.info("\n" + "=" * 60)
+            self.logger.info("\n%s", _SEP)
             self.logger.info("步骤 1: 从 dashboard HTML 中提取课程 URL")
-            self.logger.info("=" * 60)
+            self.logger.info(_SEP)
             
             # 提取课程 URL
             course_urls = self.url_extractor.extract_course_urls(dashboard_html_file)
@@ -82,18 +107,19 @@ class CourseAssignmentsCapture:
             
             self.logger.info(f"✅ 提取到 {len(course_urls)} 个课程 URL:")
             for course_url in course_urls:
-                self.logger.info(f"   - {course_url}")
+                self.logger.info("   - %s", course_url)
             
             # 步骤 2: 生成 assignments URL
-            self.logger.info("\n" + "=" * 60)
+            self.logger.info("\n%s", _SEP)
             self.logger.info("步骤 2: 生成 assignments URL")
-            self.logger.info("=" * 60)
+            self.logger.info(_SEP)
             
-            # 提取基础 URL
+            # 提取基础 URL（优先使用配置中解析出的基础 URL，仅在无法解析时才重新解析 HTML）
+            base_url = base_url or self.base_url
             if not base_url:
                 from bs4 import BeautifulSoup
-                html_content = Path(dashboard_html_file).read_text(encoding='utf-8')
-                soup = BeautifulSoup(html_content, 'html.parser')
+                html_content = read_html_file(dashboard_html_file)
+                soup = BeautifulSoup(html_content, HTML_PARSER)
                 base_url = self.url_extractor._extract_base_url(
                     html_content,
                     soup
@@ -106,54 +132,36 @@ class CourseAssignmentsCapture:
             
             self.logger.info(f"✅ 生成了 {len(assignments_urls)} 个 assignments URL:")
             for url in assignments_urls:
-                self.logger.info(f"   - {url}")
+                self.logger.info("   - %s", url)
             
             # 步骤 3: 批量捕获 assignments 页面
-            self.logger.info("\n" + "=" * 60)
+            self.logger.info("\n%s", _SEP)
             self.logger.info("步骤 3: 批量捕获 assignments 页面")
-            self.logger.info("=" * 60)
-            
-            # 获取 dashboard HTML 文件的目录（作为父级目录）
-            dashboard_path = Path(dashboard_html_file)
-            dashboard_dir = dashboard_path.parent
+            self.logger.info(_SEP)
             
             # 设置父级 HTML 文件路径（用于创建层级结构）
-            parent_html_file = str(dashboard_path)
+            parent_html_file = str(Path(dashboard_html_file))
+            
+            # 所有 assignments 页面并发捕获（共享同一个浏览器会话，并发数受 max_concurrency 限制）
+            # 不使用课程名称，直接使用 URL 生成文件夹名
+            captured = await self.url_capture_service.capture_many(
+                assignments_urls,
+                parent_html_file=parent_html_file
+            )
             
             results = []
             total = len(assignments_urls)
             
-            for i, assignments_url in enumerate(assignments_urls, 1):
-                try:
-                    self.logger.info(f"\n[{i}/{total}] 捕获 assignments 页面: {assignments_url}")
-                    
-                    # 设置父级 HTML 文件路径（用于生成层级结构）
-                    # 不使用课程名称，直接使用 URL 生成文件夹名
-                    self.url_capture_service._parent_html_file = parent_html_file
-                    self.url_capture_service._course_name = None
-                    
-                    # 捕获 URL
-                    result = await self.url_capture_service.capture_url(assignments_url)
-                    
-                    # 清除父级 HTML 文件路径和课程名称
-                    if hasattr(self.url_capture_service, '_parent_html_file'):
-                        delattr(self.url_capture_service, '_parent_html_file')
-                    if hasattr(self.url_capture_service, '_course_name'):
-                        delattr(self.url_capture_service, '_course_name')
-                    
-                    if result:
-                        results.append(result)
-                        self.logger.info(f"✅ [{i}/{total}] 捕获成功: {result.html_file}")
-                    else:
-                        self.logger.error(f"❌ [{i}/{total}] 捕获失败")
-                        
-                except Exception as e:
-                    self.logger.error(f"❌ [{i}/{total}] 捕获 assignments 页面时出错: {str(e)}", exc_info=True)
-                    continue
-            
-            self.logger.info("\n" + "=" * 60)
+            for i, (assignments_url, result) in enumerate(zip(assignments_urls, captured), 1):
+                if result:
+                    results.append(result)
+                    self.logger.info("✅ [%d/%d] 捕获成功: %s", i, total, result.html_file)
+                else:
+                    self.logger.error("❌ [%d/%d] 捕获失败: %s", i, total, assignments_url)
+            
+            self.logger.info("\n%s", _SEP)
             self.logger.info(f"✅ 批量捕获完成: 成功 {len(results)}/{total}")
-            self.logger.info("=" * 60)
+            self.logger.info(_SEP)
             
             return results
             
@@ -2,13 +2,56 @@
 课程 URL 提取器
 从 dashboard HTML 中提取所有课程 URL，并生成 assignments URL
 """
-import sys
+import os
 import re
+import importlib.util
 import logging
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Set
+from typing import TYPE_CHECKING, List, Set
 from urllib.parse import urljoin, urlparse
-from bs4 import BeautifulSoup
+
+if TYPE_CHECKING:
+    # 仅用于类型注解，运行时不导入 bs4（课程 URL 提取只使用正则表达式）
+    from bs4 import BeautifulSoup
+
+# lxml 为可选依赖，解析速度明显快于内置的 html.parser
+# 只检查是否安装，不在导入时加载（仅在需要解析 HTML 时由 BeautifulSoup 加载）
+HTML_PARSER = 'lxml' if importlib.util.find_spec('lxml') is not None else 'html.parser'
+
+# 包含 originalName、id 和 href 的课程 JSON 对象
+COURSE_BLOCK_RE = re.compile(
+    r'\{[^{}]*(?:"originalName":"[^"]+")[^{}]*(?:"id":"\d+")[^{}]*(?:"href":"[^"]+")[^{}]*\}',
+    re.DOTALL
+)
+# 绝对地址链接（http:// 或 https:// 开头）
+ABSOLUTE_HREF_RE = re.compile(r'^https?://')
+# 课程 URL（/courses/数字）
+COURSE_ID_RE = re.compile(r'/courses/(\d+)')
+# 课程对象中的字段（一次扫描同时匹配三个字段）
+COURSE_FIELD_RE = re.compile(r'"(originalName|id|href)":"([^"]+)"')
+
+
+@lru_cache(maxsize=32)
+def _read_html_cached(html_file: str, mtime_ns: int) -> str:
+    """按路径和修改时间缓存的文件读取（文件被修改后自动失效）"""
+    with open(html_file, 'r', encoding='utf-8') as f:
+        return f.read()
+
+
+def read_html_file(html_file: str) -> str:
+    """
+    读取 HTML 文件内容
+    dashboard 等文件会被多个提取步骤读取，缓存后只需读取一次
+    
+    Args:
+        html_file: HTML 文件路径
+        
+    Returns:
+        str: HTML 内容
+    """
+    html_file = str(html_file)
+    return _read_html_cached(html_file, os.stat(html_file).st_mtime_ns)
 
 
 class CourseURLExtractor:
@@ -49,9 +92,8 @@ class CourseURLExtractor:
             return course_info_map
         
         try:
-            # 读取 HTML 文件
-            with open(html_file, 'r', encoding='utf-8') as f:
-                html_content = f.read()
+            # 读取 HTML 文件（同一文件在多个步骤中只读取一次）
+            html_content = read_html_file(html_file)
             
             # 直接搜索 "originalName" 字段来提取课程信息
             # 匹配包含 originalName、id 和 href 的 JSON 对象
@@ -59,18 +101,20 @@ class CourseURLExtractor:
             
             # 搜索所有包含 originalName 的课程对象（字段顺序可能不同）
             # 使用更灵活的匹配，分别提取三个字段
-            course_blocks = re.findall(r'\{[^{}]*(?:"originalName":"[^"]+")[^{}]*(?:"id":"\d+")[^{}]*(?:"href":"[^"]+")[^{}]*\}', html_content, re.DOTALL)
+            course_blocks = COURSE_BLOCK_RE.findall(html_content)
             
             for block in course_blocks:
-                # 从块中分别提取 originalName、id 和 href
-                original_name_match = re.search(r'"originalName":"([^"]+)"', block)
-                id_match = re.search(r'"id":"(\d+)"', block)
-                href_match = re.search(r'"href":"([^"]+)"', block)
+                # 一次扫描提取 originalName、id 和 href（每个字段取第一次出现的值，id 必须为数字）
+                fields = {}
+                for key, value in COURSE_FIELD_RE.findall(block):
+                    if key in fields or (key == 'id' and not value.isdigit()):
+                        continue
+                    fields[key] = value
                 
-                if original_name_match and id_match and href_match:
-                    original_name = original_name_match.group(1)
-                    course_id = id_match.group(1)
-                    href = href_match.group(1)
+                if len(fields) == 3:
+                    original_name = fields['originalName']
+                    course_id = fields['id']
+                    href = fields['href']
                     
                     # 清理转义字符
                     try:
@@ -80,7 +124,7 @@ class CourseURLExtractor:
                     
                     # 直接存储 originalName，用作文件夹名
                     course_info_map[course_id] = original_name
-                    self.logger.debug(f"提取课程: {course_id} -> {original_name} ({href})")
+                    self.logger.debug("提取课程: %s -> %s (%s)", course_id, original_name, href)
             
             self.logger.info(f"✅ 从 HTML 中提取到 {len(course_info_map)} 个课程信息")
             
@@ -105,32 +149,16 @@ class CourseURLExtractor:
             return []
         
         try:
-            # 读取 HTML 文件
-            with open(html_file, 'r', encoding='utf-8') as f:
-                html_content = f.read()
-            
-            # 使用 BeautifulSoup 解析
-            soup = BeautifulSoup(html_content, 'html.parser')
-            
-            # 提取基础 URL
-            base_url = self._extract_base_url(html_content, soup)
-            
-            # 使用正则表达式提取所有 /courses/数字 的 URL
-            course_urls: Set[str] = set()
-            
-            # 从 href 属性中提取
-            for link in soup.find_all('a', href=True):
-                href = link.get('href', '')
-                course_url = self._extract_course_url_from_href(href, base_url)
-                if course_url:
-                    course_urls.add(course_url)
+            # 读取 HTML 文件（同一文件在多个步骤中只读取一次）
+            html_content = read_html_file(html_file)
             
-            # 从 JavaScript 代码中提取（很多课程 URL 可能在 JS 数据中）
-            js_pattern = r'/courses/(\d+)'
-            matches = re.findall(js_pattern, html_content)
-            for match in matches:
-                course_url = f"/courses/{match}"
-                course_urls.add(course_url)
+            # 使用正则表达式在整个 HTML 中提取所有 /courses/数字 的 URL
+            # 同时覆盖 href 属性和 JavaScript 数据（链接中的 /courses/数字 也是 HTML 文本的一部分），
+            # 因此无需再用 BeautifulSoup 构建 DOM 树逐个遍历链接
+            course_urls: Set[str] = {
+                f"/courses/{course_id}"
+                for course_id in COURSE_ID_RE.findall(html_content)
+            }
             
             # 转换为列表并排序
             course_urls_list = sorted(list(course_urls))
@@ -143,7 +171,7 @@ class CourseURLExtractor:
             self.logger.error(f"❌ 提取课程 URL 时出错: {str(e)}", exc_info=True)
             return []
     
-    def _extract_base_url(self, html_content: str, soup: BeautifulSoup) -> str:
+    def _extract_base_url(self, html_content: str, soup: 'BeautifulSoup') -> str:
         """
         从 HTML 中提取基础 URL
         
@@ -166,45 +194,15 @@ class CourseURLExtractor:
         if env_match:
             return env_match.group(1)
         
-        # 尝试从其他链接中提取基础 URL
-        for link in soup.find_all('a', href=True):
-            href = link.get('href', '')
-            if href.startswith('http://') or href.startswith('https://'):
-                parsed = urlparse(href)
-                return f"{parsed.scheme}://{parsed.netloc}"
+        # 尝试从第一个绝对地址链接中提取基础 URL（find 找到后立即停止，不构建完整列表）
+        link = soup.find('a', href=ABSOLUTE_HREF_RE)
+        if link:
+            parsed = urlparse(link['href'])
+            return f"{parsed.scheme}://{parsed.netloc}"
         
         # 默认值
         return "https://sit.instructure.com"
     
-    def _extract_course_url_from_href(self, href: str, base_url: str) -> str:
-        """
-        从 href 中提取课程 URL
-        
-        Args:
-            href: 链接的 href 属性
-            base_url: 基础 URL
-            
-        Returns:
-            str: 课程 URL（如 /courses/123），如果没有则返回 None
-        """
-        if not href:
-            return None
-        
-        # 如果是完整 URL，先解析
-        if href.startswith('http://') or href.startswith('https://'):
-            parsed = urlparse(href)
-            path = parsed.path
-        else:
-            path = href
-        
-        # 匹配 /courses/数字 的模式
-        match = re.match(r'/courses/(\d+)', path)
-        if match:
-            course_id = match.group(1)
-            return f"/courses/{course_id}"
-        
-        return None
-    
     def generate_assignments_urls(
         self, 
         course_urls: List[str], 
@@ -3,15 +3,10 @@
 """
 import asyncio
 import argparse
-import sys
 import logging
 from pathlib import Path
 
-# 添加 Web_analys 目录到路径
-sys.path.insert(0, str(Path(__file__).parent / "Web_analys"))
-# 添加 utils 目录到路径
-sys.path.insert(0, str(Path(__file__).parent / "utils"))
-
+# 导入 Web_analys 包时会确保项目根目录在 sys.path 中（包内通过 utils 包导入 url_utils）
 from Web_analys.config_manager import ConfigManager
 from Web_analys.BrowserManager import ChromeManager, EdgeManager
 from Web_analys.core.url_capture_service import URLCaptureService
@@ -132,10 +127,10 @@ async def main_async():
     logger.info("\n步骤 3: 确保浏览器正在运行")
     logger.info("-" * 60)
     
-    if not browser_manager.is_running():
+    if not await browser_manager.is_running_async():
         logger.warning("⚠️  浏览器未运行，尝试启动...")
         try:
-            browser_manager.start()
+            await browser_manager.start_async()
             logger.info("✅ 浏览器已启动")
         except Exception as e:
             logger.error(f"❌ 启动浏览器失败: {e}")
@@ -152,60 +147,67 @@ async def main_async():
         logger=logger
     )
     
+    # 所有步骤共享同一个 URL 捕获服务，整个运行期间只建立一次浏览器连接
     try:
-        dashboard_result = await url_capture_service.capture_url(dashboard_url)
+        try:
+            dashboard_result = await url_capture_service.capture_url(dashboard_url)
+            
+            if not dashboard_result:
+                logger.error("❌ 捕获 dashboard 页面失败")
+                return
+            
+            logger.info(f"✅ Dashboard 页面已保存: {dashboard_result.html_file}")
         
-        if not dashboard_result:
-            logger.error("❌ 捕获 dashboard 页面失败")
+        except Exception as e:
+            logger.error(f"❌ 捕获 dashboard 页面时出错: {e}", exc_info=True)
             return
         
-        logger.info(f"✅ Dashboard 页面已保存: {dashboard_result.html_file}")
+        # 从 dashboard HTML 中提取课程并批量捕获 assignments 页面
+        logger.info("\n步骤 5: 从 dashboard HTML 提取课程并批量捕获 assignments 页面")
+        logger.info("-" * 60)
         
-    except Exception as e:
-        logger.error(f"❌ 捕获 dashboard 页面时出错: {e}", exc_info=True)
-        return
-    
-    # 从 dashboard HTML 中提取课程并批量捕获 assignments 页面
-    logger.info("\n步骤 5: 从 dashboard HTML 提取课程并批量捕获 assignments 页面")
-    logger.info("-" * 60)
-    
-    course_capture_service = CourseAssignmentsCapture(
-        browser_manager=browser_manager,
-        output_dir=output_dir,
-        logger=logger
-    )
-    
-    try:
-        assignments_results = await course_capture_service.capture_from_dashboard_html(
-            dashboard_result.html_file
+        course_capture_service = CourseAssignmentsCapture(
+            browser_manager=browser_manager,
+            output_dir=output_dir,
+            logger=logger,
+            url_capture_service=url_capture_service
         )
         
-        logger.info(f"✅ 成功捕获 {len(assignments_results)} 个 assignments 页面")
+        try:
+            assignments_results = await course_capture_service.capture_from_dashboard_html(
+                dashboard_result.html_file
+            )
+            
+            logger.info(f"✅ 成功捕获 {len(assignments_results)} 个 assignments 页面")
         
-    except Exception as e:
-        logger.error(f"❌ 捕获 assignments 页面时出错: {e}", exc_info=True)
-        return
-    
-    # 从 assignments 页面中提取并批量捕获 assignment 详情页面
-    logger.info("\n步骤 6: 从 assignments 页面提取并批量捕获 assignment 详情页面")
-    logger.info("-" * 60)
-    
-    assignment_detail_capture_service = AssignmentDetailCapture(
-        browser_manager=browser_manager,
-        output_dir=output_dir,
-        logger=logger
-    )
-    
-    try:
-        assignment_detail_results = await assignment_detail_capture_service.capture_all_from_output_dir(
-            output_dir
+        except Exception as e:
+            logger.error(f"❌ 捕获 assignments 页面时出错: {e}", exc_info=True)
+            return
+        
+        # 从 assignments 页面中提取并批量捕获 assignment 详情页面
+        logger.info("\n步骤 6: 从 assignments 页面提取并批量捕获 assignment 详情页面")
+        logger.info("-" * 60)
+        
+        assignment_detail_capture_service = AssignmentDetailCapture(
+            browser_manager=browser_manager,
+            output_dir=output_dir,
+            logger=logger,
+            url_capture_service=url_capture_service
         )
         
-        logger.info(f"✅ 成功捕获 {len(assignment_detail_results)} 个 assignment 详情页面")
+        try:
+            assignment_detail_results = await assignment_detail_capture_service.capture_all_from_output_dir(
+                output_dir
+            )
+            
+            logger.info(f"✅ 成功捕获 {len(assignment_detail_results)} 个 assignment 详情页面")
         
-    except Exception as e:
-        logger.error(f"❌ 捕获 assignment 详情页面时出错: {e}", exc_info=True)
-        return
+        except Exception as e:
+            logger.error(f"❌ 捕获 assignment 详情页面时出错: {e}", exc_info=True)
+            return
+    finally:
+        await url_capture_service.close()
+        await browser_manager.disconnect()
     
     # 完成
     logger.info("\n" + "=" * 60)
@@ -4,6 +4,7 @@
 """
 from .url_utils import (
     is_target_url,
+    compile_target_matcher,
     url_to_folder_name,
     url_to_subfolder_name
 )
@@ -11,6 +12,7 @@ from .output_cleaner import clean_output_dir
 
 __all__ = [
     'is_target_url',
+    'compile_target_matcher',
     'url_to_folder_name',
     'url_to_subfolder_name',
     'clean_output_dir'
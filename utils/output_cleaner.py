@@ -32,10 +32,10 @@ def clean_output_dir(output_dir: str, logger: Optional[logging.Logger] = None) -
         for item in output_path.iterdir():
             if item.is_file():
                 item.unlink()
-                logger.debug(f"删除文件: {item}")
+                logger.debug("删除文件: %s", item)
             elif item.is_dir():
                 shutil.rmtree(item)
-                logger.debug(f"删除目录: {item}")
+                logger.debug("删除目录: %s", item)
         
         logger.info(f"✅ 已清理输出目录: {output_dir}")
         return True
@@ -3,8 +3,9 @@ URL 工具函数
 提供 URL 处理、匹配和转换的工具函数
 """
 import re
-from urllib.parse import urlparse, urlunparse
-from typing import List, Union
+from functools import lru_cache
+from urllib.parse import urlparse
+from typing import Dict, List, Optional, Pattern, Tuple, Union
 
 
 def is_target_url(url: str, target_urls: Union[str, List[str]]) -> bool:
@@ -25,39 +26,76 @@ def is_target_url(url: str, target_urls: Union[str, List[str]]) -> bool:
     if isinstance(target_urls, str):
         target_urls = [target_urls]
     
-    # 解析目标 URL
+    # 快速路径：与某个目标 URL 完全相同时无需解析
+    if url in target_urls:
+        return True
+    
+    # 按域名索引的目标路径前缀（同一组目标 URL 只解析一次）
+    target_index = _build_target_index(tuple(target_urls))
     parsed_url = urlparse(url)
+    path_prefixes = target_index.get(parsed_url.netloc)
+    if not path_prefixes:
+        return False
+    
+    # 检查路径是否以目标路径开头（根路径目标的前缀为空，匹配该域名的所有页面）
+    url_path = parsed_url.path.rstrip('/')
+    return url_path.startswith(path_prefixes)
+
+
+@lru_cache(maxsize=64)
+def _build_target_index(target_urls: Tuple[str, ...]) -> Dict[str, Tuple[str, ...]]:
+    """
+    将目标 URL 列表解析为按域名索引的路径前缀
     
+    Args:
+        target_urls: 目标 URL 元组
+        
+    Returns:
+        Dict[str, Tuple[str, ...]]: 域名到路径前缀元组的映射（根路径目标的前缀为空字符串）
+    """
+    index: Dict[str, List[str]] = {}
     for target_url in target_urls:
         if not target_url:
             continue
         
         parsed_target = urlparse(target_url)
+        index.setdefault(parsed_target.netloc, []).append(parsed_target.path.rstrip('/'))
+    
+    return {netloc: tuple(prefixes) for netloc, prefixes in index.items()}
+
+
+def compile_target_matcher(target_urls: Union[str, List[str]]) -> Optional[Pattern[str]]:
+    """
+    将目标 URL 列表预编译为一个正则表达式，匹配规则与 is_target_url 相同
+    （域名相同，且路径以目标路径开头；根路径目标匹配该域名的所有页面）
+    
+    Args:
+        target_urls: 目标 URL 或目标 URL 列表
         
-        # 比较域名和路径
-        # 如果目标 URL 是根路径，匹配所有该域名的页面
-        if parsed_target.path == '/' or parsed_target.path == '':
-            if parsed_url.netloc == parsed_target.netloc:
-                return True
-        # 否则检查 URL 是否以目标 URL 开头
-        else:
-            # 检查域名是否相同
-            if parsed_url.netloc != parsed_target.netloc:
-                continue
-            
-            # 检查路径是否以目标路径开头
-            target_path = parsed_target.path.rstrip('/')
-            url_path = parsed_url.path.rstrip('/')
-            
-            if url_path.startswith(target_path):
-                return True
+    Returns:
+        Optional[Pattern[str]]: 编译后的正则表达式（使用 match 调用），
+            没有有效目标或目标不是绝对 URL 时返回 None（调用方应回退到 is_target_url）
+    """
+    if isinstance(target_urls, str):
+        target_urls = [target_urls]
+    
+    target_index = _build_target_index(tuple(target_urls or ()))
+    if not target_index or '' in target_index:
+        return None
+    
+    alternatives = []
+    for netloc, prefixes in target_index.items():
+        # 域名之后必须是路径、查询、片段或结尾，避免 example.com 匹配 example.com.cn
+        path_pattern = '|'.join(re.escape(prefix) for prefix in prefixes)
+        alternatives.append(f'{re.escape(netloc)}(?=[/?#]|$)(?:{path_pattern})')
     
-    return False
+    return re.compile(r'[^:/?#]+://(?:' + '|'.join(alternatives) + ')')
 
 
+@lru_cache(maxsize=1024)
 def url_to_folder_name(url: str, max_length: int = 100) -> str:
     """
-    从 URL 中提取文件夹名称
+    从 URL 中提取文件夹名称（纯函数，结果按 URL 缓存）
     
     Args:
         url: 要转换的 URL
@@ -103,9 +141,10 @@ def url_to_folder_name(url: str, max_length: int = 100) -> str:
         return 'page'
 
 
+@lru_cache(maxsize=1024)
 def url_to_subfolder_name(url: str, max_length: int = 50) -> str:
     """
-    从 URL 中提取子文件夹名称
+    从 URL 中提取子文件夹名称（纯函数，结果按 URL 缓存）
     
     Args:
         url: 要转换的 URL